@@ -4,13 +4,23 @@ Generates questions for any topic using actual AI models
 No hardcoded templates - completely AI-driven generation
 """
 
+import functools
+import hashlib
+import itertools
 import json
+import os
 import random
 import re
+import shutil
+import tempfile
+import threading
 try:
     import torch
     from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM, AutoModelForSeq2SeqLM
+    from transformers import StoppingCriteria, StoppingCriteriaList
     TRANSFORMERS_AVAILABLE = True
+    # Let any residual FP32 matmuls use TF32 on tensor cores
+    torch.set_float32_matmul_precision('high')
 except ImportError:
     TRANSFORMERS_AVAILABLE = False
     torch = None
@@ -18,9 +28,35 @@ except ImportError:
     AutoTokenizer = None
     AutoModelForCausalLM = None
     AutoModelForSeq2SeqLM = None
-from typing import Dict, List, Any, Optional
+    StoppingCriteria = object
+    StoppingCriteriaList = None
+try:
+    import onnxruntime
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from filelock import FileLock
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+    onnxruntime = None
+    FileLock = None
+    quantize_dynamic = None
+    QuantType = None
+    ORTModelForSeq2SeqLM = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 import logging
 
 # Configure logging
@@ -28,6 +64,293 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Exported/optimized model artifacts are kept here across launches
+CACHE_DIR = Path(os.environ.get("QUIZHIVE_CACHE_DIR", Path.home() / ".cache" / "quizhive"))
+
+HF_HUB_URL = "https://huggingface.co"
+
+# Serve INT8-quantized ONNX graphs on CPU (set QUIZHIVE_INT8=0 to keep float weights)
+QUANTIZE_INT8 = os.environ.get("QUIZHIVE_INT8", "1") != "0"
+
+# Intra-op threads per server worker process, so the workers together use every core once.
+# The launchers (app.py, start_server.py, gunicorn_conf.py) export WEB_CONCURRENCY; unset means one process.
+THREADS_PER_WORKER = max(1, (os.cpu_count() or 1) // int(os.environ.get("WEB_CONCURRENCY", "1")))
+
+# Intra-op threads per generate call; lowered by set_generation_concurrency when calls run side by side
+_intra_op_threads = THREADS_PER_WORKER
+
+# Bump when prompts or models change so cached questions are regenerated
+QUESTION_MODEL_VERSION = "t5-small-v1"
+
+# (task, model name) for each cached pipeline kind; generation settings are passed to model.generate
+_PIPELINE_SPECS = {
+    "t5": ("text2text-generation", "t5-small"),
+    "distilgpt2": ("text-generation", "distilgpt2"),
+}
+
+# Prompts per generate call; prompts are length-sorted first so each batch pads little
+GENERATION_BATCH_SIZE = 16
+
+# Sampled single-beam decoding with the KV cache, capped to what a question or explanation needs
+_QUESTION_GENERATION_KWARGS = {
+    "do_sample": True,
+    "num_beams": 1,
+    "use_cache": True,
+    "max_new_tokens": 120,
+    "temperature": 0.8,
+}
+_EXPLANATION_GENERATION_KWARGS = {
+    "do_sample": True,
+    "num_beams": 1,
+    "use_cache": True,
+    "max_new_tokens": 60,
+    "temperature": 0.7,
+}
+
+
+def _select_torch_dtype(task: str):
+    """Pick half precision on tensor-core GPUs, otherwise keep the checkpoint dtype"""
+    if torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 7:
+        # Ampere and newer handle bfloat16 natively
+        if torch.cuda.get_device_capability()[0] >= 8:
+            return torch.bfloat16
+        # T5 activations overflow in float16, so only the decoder-only model drops to it
+        if task == "text-generation":
+            return torch.float16
+    return "auto"
+
+
+# Option letters and every ordering of the four options
+_OPTION_LETTERS = ("A", "B", "C", "D")
+_OPTION_PERMUTATIONS = tuple(itertools.permutations(range(4)))
+
+# Option markers such as "A)" or "B." at the start of the text or after whitespace
+_OPTION_MARKER_RE = re.compile(r'(?:^|(?<=\s))([A-D])[\).]')
+# Answer lines such as "Answer: B" or "The correct answer is C"
+_ANSWER_RE = re.compile(r'(?:(?:the\s+)?correct answer|answer|correct)(?:\s+is)?\s*:?\s*\(?([A-D])\b', re.IGNORECASE)
+
+
+def _probe_hub_ssl_mode() -> str:
+    """Probe the Hub once and return the SSL mode: verify, insecure or offline"""
+    import requests
+    
+    try:
+        requests.head(HF_HUB_URL, timeout=5)
+        return "verify"
+    except requests.exceptions.SSLError:
+        pass
+    except requests.exceptions.RequestException:
+        return "offline"
+    
+    # Corporate proxies often re-sign TLS traffic with an untrusted root
+    try:
+        requests.head(HF_HUB_URL, timeout=5, verify=False)
+        return "insecure"
+    except requests.exceptions.RequestException:
+        return "offline"
+
+
+def _resolve_hub_ssl_mode() -> str:
+    """Reuse the SSL mode from a previous launch, probing only when none is recorded"""
+    mode_file = CACHE_DIR / "ssl_mode"
+    if mode_file.exists():
+        mode = mode_file.read_text().strip()
+        if mode in ("verify", "insecure"):
+            return mode
+    
+    mode = _probe_hub_ssl_mode()
+    # Offline is not persisted so the next launch tries the network again
+    if mode != "offline":
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        mode_file.write_text(mode)
+    return mode
+
+
+class _QuestionStoppingCriteria(StoppingCriteria):
+    """Stop each sequence once its answer line is out, or early if no option has started"""
+    
+    def __init__(self, tokenizer, option_deadline: int = 50, window: int = 8):
+        self.tokenizer = tokenizer
+        self.option_deadline = option_deadline
+        self.window = window
+        self._seen_option = []
+        self._last_length = 0
+    
+    def __call__(self, input_ids, scores, **kwargs):
+        batch_size, length = input_ids.shape
+        # A shorter sequence means generate started on a new batch
+        if length <= self._last_length or len(self._seen_option) != batch_size:
+            self._seen_option = [False] * batch_size
+        self._last_length = length
+        
+        # Only the newest tokens need decoding to spot "A)" or "Answer: B"
+        tails = self.tokenizer.batch_decode(input_ids[:, -self.window:], skip_special_tokens=True)
+        done = []
+        for row, tail in enumerate(tails):
+            if not self._seen_option[row] and _OPTION_MARKER_RE.search(tail):
+                self._seen_option[row] = True
+            answered = self._seen_option[row] and _ANSWER_RE.search(tail) is not None
+            stalled = not self._seen_option[row] and length >= self.option_deadline
+            done.append(answered or stalled)
+        
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+
+def _build_cache_dir(target_dir: Path, build):
+    """Run build into a private temp dir and move it to target_dir; the directory only appears when complete"""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    # Workers starting together wait for whichever one builds first and reuse its result
+    with FileLock(str(target_dir) + ".lock"):
+        if target_dir.exists():
+            return
+        build_dir = Path(tempfile.mkdtemp(prefix=target_dir.name + ".", dir=CACHE_DIR))
+        try:
+            build(build_dir)
+            os.replace(build_dir, target_dir)
+        except OSError:
+            # Another host sharing the cache may have published it first
+            if not target_dir.exists():
+                raise
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def set_generation_concurrency(concurrent_calls: int):
+    """Split the worker's threads across concurrent generate calls; takes effect for models loaded afterwards"""
+    global _intra_op_threads
+    _intra_op_threads = max(1, THREADS_PER_WORKER // concurrent_calls)
+
+
+def _export_onnx(model_name: str, export_dir: Path):
+    """Export a seq2seq model to ONNX once"""
+    def build(build_dir: Path):
+        logger.info(f"Exporting {model_name} to ONNX at {export_dir}...")
+        ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(build_dir)
+    
+    _build_cache_dir(export_dir, build)
+
+
+def _quantize_onnx_int8(export_dir: Path, int8_dir: Path):
+    """Dynamically quantize every exported ONNX graph to INT8 weights"""
+    def build(build_dir: Path):
+        logger.info(f"Quantizing {export_dir.name} to INT8 at {int8_dir}...")
+        for onnx_file in export_dir.glob("*.onnx"):
+            quantize_dynamic(onnx_file, build_dir / onnx_file.name, weight_type=QuantType.QInt8)
+        # Configs are needed to load the quantized graphs as a model
+        for config_file in export_dir.glob("*.json"):
+            shutil.copy(config_file, build_dir / config_file.name)
+    
+    _build_cache_dir(int8_dir, build)
+
+
+def _load_ort_seq2seq(model_name: str):
+    """Load a seq2seq model on ONNX Runtime, exporting it to the cache on first use"""
+    # Artifacts are rebuilt whenever the runtime version changes
+    export_dir = CACHE_DIR / f"{model_name}-onnx-ort{onnxruntime.__version__}"
+    int8_dir = CACHE_DIR / f"{model_name}-onnx-int8-ort{onnxruntime.__version__}"
+    use_cuda = torch.cuda.is_available()
+    
+    session_options = onnxruntime.SessionOptions()
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session_options.intra_op_num_threads = _intra_op_threads
+    ort_kwargs = {
+        "provider": "CUDAExecutionProvider" if use_cuda else "CPUExecutionProvider",
+        "session_options": session_options,
+        # IO binding keeps inputs and outputs on the GPU between steps
+        "use_io_binding": use_cuda,
+    }
+    
+    if not export_dir.exists():
+        _export_onnx(model_name, export_dir)
+    
+    # INT8 weights roughly halve CPU latency; GPUs keep the float graph
+    if use_cuda or not QUANTIZE_INT8:
+        return ORTModelForSeq2SeqLM.from_pretrained(export_dir, **ort_kwargs)
+    
+    if not int8_dir.exists():
+        _quantize_onnx_int8(export_dir, int8_dir)
+    return ORTModelForSeq2SeqLM.from_pretrained(int8_dir, **ort_kwargs)
+
+
+@functools.lru_cache(maxsize=2)
+def _get_pipeline(kind: str):
+    """Load a generation pipeline once per process and share it across generators"""
+    task, model_name = _PIPELINE_SPECS[kind]
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    
+    # GPT-2 has no pad token; reuse EOS so batches can be padded
+    if tokenizer.pad_token_id is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    
+    # ONNX Runtime serves the seq2seq question model when optimum is installed; it is only a speed-up,
+    # so a failed export or quantization falls back to the eager model below
+    if ORT_AVAILABLE and task == "text2text-generation":
+        try:
+            model = _load_ort_seq2seq(model_name)
+            return pipeline(task, model=model, tokenizer=tokenizer)
+        except Exception as e:
+            logger.warning(f"ONNX Runtime unavailable for {model_name}, loading it with torch: {e}")
+    
+    torch.set_num_threads(_intra_op_threads)
+    model_class = AutoModelForSeq2SeqLM if task == "text2text-generation" else AutoModelForCausalLM
+    model = model_class.from_pretrained(model_name, torch_dtype=_select_torch_dtype(task))
+    
+    return pipeline(
+        task,
+        model=model,
+        tokenizer=tokenizer,
+        device=0 if torch.cuda.is_available() else -1
+    )
+
+
+class QuestionCache:
+    """Generated question data keyed by its inputs: an in-process LRU over an optional disk cache"""
+    
+    def __init__(self, directory: Path, max_memory_items: int = 1024, expire_seconds: int = 30 * 86400):
+        self.max_memory_items = max_memory_items
+        self.expire_seconds = expire_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # The disk tier survives restarts when diskcache is installed
+        self._disk = diskcache.Cache(str(directory)) if diskcache else None
+    
+    @staticmethod
+    def make_key(topic: str, level: str, concept: str, core_type: str, occurrence: int = 0) -> str:
+        """Hash the generation inputs, and which repeat of them within a quiz this is, into a cache key"""
+        raw = f"{topic}|{level}|{concept}|{core_type}|{occurrence}|{QUESTION_MODEL_VERSION}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached question data, or None"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        
+        if data is None and self._disk is not None:
+            data = self._disk.get(key)
+            if data is not None:
+                self._remember(key, data)
+        
+        # Callers own the returned options dict
+        return {**data, "options": dict(data["options"])} if data is not None else None
+    
+    def set(self, key: str, data: Dict[str, Any]):
+        """Store a copy of the question data in memory and on disk"""
+        # The caller keeps using its dict as the question's options, so the cache owns a separate one
+        data = {**data, "options": dict(data["options"])}
+        self._remember(key, data)
+        if self._disk is not None:
+            self._disk.set(key, data, expire=self.expire_seconds)
+    
+    def _remember(self, key: str, data: Dict[str, Any]):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+
 @dataclass
 class QuestionRequest:
     """Request structure for question generation"""
@@ -39,7 +362,7 @@ class QuestionRequest:
     question_types: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeneratedQuestion:
     """Structure for generated questions"""
     id: str
@@ -50,18 +373,24 @@ class GeneratedQuestion:
     options: Dict[str, str]
     correct: str
     explanation: str
+    generated_at: str
 
 
 class AIQuestionGenerator:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.question_id_counter = 1000
+        # One RNG for every sampling decision; pass a seed for reproducible quizzes
+        self._rng = random.Random(seed)
+        self._id_lock = threading.Lock()
         self.device = "cuda" if (torch and torch.cuda.is_available()) else "cpu"
         
+        # Concepts and templates are used by both the AI and the fallback path
+        self._initialize_fallback_system()
+        
         # Check if transformers are available
         if not TRANSFORMERS_AVAILABLE:
             logger.info("Transformers not available, using fallback mode...")
             self.models_loaded = False
-            self._initialize_fallback_system()
         else:
             logger.info(f"Initializing True AI Question Generator on {self.device}...")
             # Initialize AI models
@@ -81,111 +410,71 @@ class AIQuestionGenerator:
         try:
             logger.info("Loading AI models...")
             
-            # Configure environment for corporate network
-            import os
-            import ssl
-            
             # Remove any proxy settings that might interfere
             os.environ.pop('HTTPS_PROXY', None)
             os.environ.pop('HTTP_PROXY', None)
             
-            # Try different SSL configurations
-            ssl_configs = [
-                # Method 1: Disable SSL verification (most permissive)
-                lambda: self._load_models_with_ssl(False),
-                # Method 2: Try with default SSL settings
-                lambda: self._load_models_with_ssl(True),
-                # Method 3: Try with custom SSL context
-                lambda: self._load_models_with_custom_ssl(),
-            ]
-            
-            for i, ssl_method in enumerate(ssl_configs):
-                try:
-                    logger.info(f"Trying SSL configuration method {i+1}...")
-                    ssl_method()
-                    self.models_loaded = True
-                    logger.info("AI models loaded successfully")
-                    return
-                except Exception as ssl_e:
-                    logger.warning(f"SSL method {i+1} failed: {ssl_e}")
-                    continue
+            # Bound download hangs and decide SSL handling once, before any model shard is fetched
+            os.environ.setdefault('HF_HUB_DOWNLOAD_TIMEOUT', '10')
+            ssl_mode = _resolve_hub_ssl_mode()
+            logger.info(f"Hugging Face Hub access mode: {ssl_mode}")
+            if ssl_mode == "insecure":
+                os.environ['CURL_CA_BUNDLE'] = ''
+                os.environ['REQUESTS_CA_BUNDLE'] = ''
+            elif ssl_mode == "offline":
+                # Only locally cached models can load
+                os.environ['HF_HUB_OFFLINE'] = '1'
             
-            # If all SSL methods fail, use fallback
-            raise Exception("All SSL configuration methods failed")
+            # Pipelines are cached per process, so repeated instantiation is free
+            self.question_generator = _get_pipeline("t5")
+            self.question_cache = QuestionCache(CACHE_DIR / "questions")
+            self.models_loaded = True
+            logger.info("AI models loaded successfully")
             
         except Exception as e:
             logger.error(f"Failed to load AI models: {e}")
             logger.info("Using fallback template system instead")
             self.models_loaded = False
-            self._initialize_fallback_system()
-    
-    def _load_models_with_ssl(self, verify_ssl):
-        """Load models with specified SSL verification"""
-        import os
-        if verify_ssl:
-            # Enable SSL verification
-            os.environ.pop('CURL_CA_BUNDLE', None)
-            os.environ.pop('REQUESTS_CA_BUNDLE', None)
-        else:
-            # Disable SSL verification
-            os.environ['CURL_CA_BUNDLE'] = ''
-            os.environ['REQUESTS_CA_BUNDLE'] = ''
-        
-        # Use smaller models for CPU efficiency
-        self.question_generator = pipeline(
-            "text2text-generation",
-            model="t5-small",
-            device=0 if self.device == "cuda" else -1,
-            max_length=300,
-            tokenizer="t5-small"
-        )
-        
-        self.concept_generator = pipeline(
-            "text-generation", 
-            model="distilgpt2",
-            device=0 if self.device == "cuda" else -1,
-            max_new_tokens=50,
-            tokenizer="distilgpt2"
-        )
     
-    def _load_models_with_custom_ssl(self):
-        """Load models with custom SSL context"""
-        import ssl
-        import os
-        from transformers import utils
-        
-        # Create unverified SSL context
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Set custom SSL context for transformers
-        os.environ['CURL_CA_BUNDLE'] = ''
-        os.environ['REQUESTS_CA_BUNDLE'] = ''
-        
-        # Try to patch the SSL verification in transformers
-        original_verify = utils.http_backends.verify_ssl
-        utils.http_backends.verify_ssl = False
+    def compile(self):
+        """Compile the question model and warm it up so the first request pays no compilation cost"""
+        if not self.models_loaded:
+            return
+        
+        model = self.question_generator.model
+        eager_forward = None
+        # ONNX Runtime sessions are already optimized graphs; only eager torch modules get compiled.
+        # The pipeline is shared across generators, so a model that already carries _eager_forward is not wrapped again.
+        if isinstance(model, torch.nn.Module) and hasattr(torch, "compile") and not hasattr(model, "_eager_forward"):
+            # Inductor keeps compiled kernels here, keyed by graph and torch version, across restarts
+            os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(CACHE_DIR / "inductor"))
+            os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+            try:
+                eager_forward = model.forward
+                model.forward = torch.compile(eager_forward, mode="reduce-overhead", dynamic=True)
+                model._eager_forward = eager_forward
+                logger.info("Question model compiled with torch.compile")
+            except Exception as e:
+                eager_forward = None
+                logger.warning(f"torch.compile unavailable, running eagerly: {e}")
         
         try:
-            self.question_generator = pipeline(
-                "text2text-generation",
-                model="t5-small",
-                device=0 if self.device == "cuda" else -1,
-                max_length=300,
-                tokenizer="t5-small"
-            )
-            
-            self.concept_generator = pipeline(
-                "text-generation", 
-                model="distilgpt2",
-                device=0 if self.device == "cuda" else -1,
-                max_new_tokens=50,
-                tokenizer="distilgpt2"
+            self._generate_texts(
+                [self._build_ai_prompt(QuestionRequest(topic="Python", level="beginner", num_questions=1), "baseline", "variables")],
+                _QUESTION_GENERATION_KWARGS
             )
-        finally:
-            # Restore original SSL verification
-            utils.http_backends.verify_ssl = original_verify
+        except Exception as e:
+            logger.warning(f"Warmup generation failed: {e}")
+            # torch.compile only fails once it traces the first call, so fall back to the eager forward
+            if eager_forward is not None:
+                model.forward = eager_forward
+                del model._eager_forward
+                logger.warning("Restored the eager question model forward")
+    
+    @functools.cached_property
+    def concept_generator(self):
+        """distilgpt2 pipeline, only loaded on first use"""
+        return _get_pipeline("distilgpt2")
     
     def _initialize_fallback_system(self):
         """Initialize fallback templates and concepts"""
@@ -241,173 +530,347 @@ class AIQuestionGenerator:
                 "What are the trade-offs when using {concept} in {topic}?"
             ]
         }
+        
+        # Exact topic names resolve with one dict lookup; partial matches are memoized
+        self._topic_lookup = {key.lower(): concepts for key, concepts in self.topic_concept_generators.items()}
+        self._match_topic_concepts = functools.lru_cache(maxsize=256)(self._find_topic_concepts)
+        
+        # Templates and option builders are fixed from here on, so resolve them per core type once
+        self._fallback_kernels = {
+            "baseline": (tuple(self.question_templates["baseline"]), self._generate_baseline_options),
+            "variable": (tuple(self.question_templates["variable"]), self._generate_variable_options)
+        }
     
     def generate_questions(self, request: QuestionRequest) -> List[GeneratedQuestion]:
         """Generate questions based on the request"""
-        questions = []
-        
+        return self.generate_questions_batch([request])[0]
+    
+    def generate_questions_batch(self, requests: List[QuestionRequest]) -> List[List[GeneratedQuestion]]:
+        """Generate questions for several requests with one model pass, one question list per request"""
+        plans = [self._plan_questions(request) for request in requests]
+        
+        # Flatten every request's questions so the model sees them as a single batch
+        owners = [request for request, (core_types, _, _) in zip(requests, plans) for _ in core_types]
+        core_types = [core_type for plan in plans for core_type in plan[0]]
+        concepts = [concept for plan in plans for concept in plan[1]]
+        templates = [template for plan in plans for template in plan[2]]
+        
+        questions_data = self._generate_questions_data(owners, core_types, concepts, templates)
+        generated_at = datetime.now().isoformat()
+        
+        results = []
+        start = 0
+        for request, (request_core_types, _, _) in zip(requests, plans):
+            question_ids = self.reserve_question_ids(len(request_core_types))
+            results.append([
+                self._build_question(request, question_id, core_type, question_data, generated_at)
+                for question_id, core_type, question_data in zip(
+                    question_ids, request_core_types, questions_data[start:start + len(request_core_types)]
+                )
+            ])
+            start += len(request_core_types)
+        
+        return results
+    
+    def iter_questions(self, request: QuestionRequest) -> Iterator[GeneratedQuestion]:
+        """Yield the questions of a request one generation batch at a time"""
+        core_types, concepts, templates = self._plan_questions(request)
+        generated_at = datetime.now().isoformat()
+        
+        for start in range(0, len(core_types), GENERATION_BATCH_SIZE):
+            chunk_core_types = core_types[start:start + GENERATION_BATCH_SIZE]
+            questions_data = self._generate_questions_data(
+                [request] * len(chunk_core_types),
+                chunk_core_types,
+                concepts[start:start + GENERATION_BATCH_SIZE],
+                templates[start:start + GENERATION_BATCH_SIZE]
+            )
+            question_ids = self.reserve_question_ids(len(chunk_core_types))
+            for question_id, core_type, question_data in zip(question_ids, chunk_core_types, questions_data):
+                yield self._build_question(request, question_id, core_type, question_data, generated_at)
+    
+    def _generate_questions_data(self, requests: List[QuestionRequest], core_types: List[str], concepts: List[str], templates: List[str]) -> List[Dict[str, Any]]:
+        """Generate question data with the AI models if available, otherwise with the fallback"""
+        if self.models_loaded:
+            return self._generate_ai_questions(requests, core_types, concepts, templates)
+        return self._generate_fallback_questions(requests, core_types, concepts, templates)
+    
+    def _plan_questions(self, request: QuestionRequest) -> Tuple[List[str], List[str], List[str]]:
+        """Choose the core type, concept and fallback template of every question in a request"""
         # Get concepts and create enough unique concepts for all questions
-        concepts = self._get_concepts_for_topic(request.topic, request.level)
+        concepts = list(self._get_concepts_for_topic(request.topic, request.level))
         
         # If we need more concepts than available, extend with universal concepts
         if len(concepts) < request.num_questions:
             universal_concepts = self.universal_concepts.get(request.level, [])
-            concepts = concepts + universal_concepts
-        
-        # Shuffle concepts to avoid repetition
-        random.shuffle(concepts)
+            concepts.extend(c for c in universal_concepts if c not in concepts)
         
-        for i in range(request.num_questions):
-            question = self._generate_single_question(request, i, concepts)
-            questions.append(question)
+        # Shuffle concepts to avoid repetition, then cycle them to one per question
+        self._rng.shuffle(concepts)
+        concepts = list(itertools.islice(itertools.cycle(concepts), request.num_questions))
         
-        return questions
-    
-    def _generate_single_question(self, request: QuestionRequest, index: int, concepts: List[str]) -> GeneratedQuestion:
-        """Generate a single question using AI models"""
-        # Determine core type
+        # Determine every core type and template up front so the per-question path is a plain lookup
         if request.core_type:
-            core_type = request.core_type
+            core_types = [request.core_type] * request.num_questions
         else:
-            core_type = self._determine_core_type(request.level, index, request.num_questions)
-        
-        # Use AI models if available, otherwise fallback
-        if self.models_loaded:
-            question_data = self._generate_ai_question(request, core_type, concepts, index)
-        else:
-            question_data = self._generate_fallback_question(request, core_type, concepts, index)
+            core_types = self._determine_core_types(request.level, request.num_questions)
+        templates = self._pick_templates(core_types)
         
+        return core_types, concepts, templates
+    
+    def reserve_question_ids(self, count: int) -> List[str]:
+        """Reserve a block of unique question IDs, safe for concurrent callers"""
+        with self._id_lock:
+            base = self.question_id_counter
+            self.question_id_counter += count
+        return [f"AI_GEN_{base + i}" for i in range(count)]
+    
+    def _pick_templates(self, core_types: List[str]) -> List[str]:
+        """Pick a fallback template for every question in one call per core type"""
+        templates = []
+        for core_type, run in itertools.groupby(core_types):
+            pool = self._fallback_kernels.get(core_type, self._fallback_kernels["baseline"])[0]
+            templates.extend(self._rng.choices(pool, k=len(list(run))))
+        return templates
+    
+    def _build_question(self, request: QuestionRequest, question_id: str, core_type: str, question_data: Dict[str, Any], generated_at: str) -> GeneratedQuestion:
+        """Wrap generated question data into a GeneratedQuestion"""
         return GeneratedQuestion(
-            id=f"AI_GEN_{self.question_id_counter + index}",
+            id=question_id,
             core_type=core_type,
             level=request.level,
             topic=request.topic,
             question=question_data["question"],
             options=question_data["options"],
             correct=question_data["correct"],
-            explanation=question_data["explanation"]
+            explanation=question_data["explanation"],
+            generated_at=generated_at
         )
     
-    def _generate_fallback_question(self, request: QuestionRequest, core_type: str, concepts: List[str], index: int) -> Dict[str, Any]:
-        """Generate question using enhanced fallback system"""
-        # Use concept from shuffled list to avoid repetition
-        concept = concepts[index % len(concepts)]
-        
-        # Get template
-        templates = self.question_templates.get(core_type, self.question_templates["baseline"])
-        template = random.choice(templates)
-        question = template.format(concept=concept, topic=request.topic)
-        
-        # Generate options based on core type
+    def _generate_fallback_questions(self, requests: List[QuestionRequest], core_types: List[str], concepts: List[str], templates: List[str]) -> List[Dict[str, Any]]:
+        """Generate questions using enhanced fallback system; requests holds the owning request of each question"""
+        correct_texts = []
+        incorrect_matrix = []
+        for request, core_type, concept in zip(requests, core_types, concepts):
+            # Generate options based on core type; anything but baseline gets variable options
+            _, generate_options = self._fallback_kernels.get(core_type, self._fallback_kernels["variable"])
+            correct_text, incorrect_options = generate_options(request.topic, concept)
+            correct_texts.append(correct_text)
+            incorrect_matrix.append(incorrect_options)
+        
+        options_list, correct_letters = self._build_all_options(correct_texts, incorrect_matrix)
+        
+        return [
+            {
+                "question": template.format(concept=concept, topic=request.topic),
+                "options": options,
+                "correct": correct_letter,
+                "explanation": f"The correct answer demonstrates proper understanding of {concept} in {request.topic} at {request.level} level."
+            }
+            for request, template, concept, options, correct_letter in zip(requests, templates, concepts, options_list, correct_letters)
+        ]
+    
+    def _build_ai_prompt(self, request: QuestionRequest, core_type: str, concept: str) -> str:
+        """Build the generation prompt for a single question"""
         if core_type == "baseline":
-            options_data = self._generate_baseline_options(request.topic, concept, request.level)
-        else:
-            options_data = self._generate_variable_options(request.topic, concept, request.level)
-        
-        return options_data
+            return f"Generate a {request.level} level baseline multiple choice question about {concept} in {request.topic}. The question should test fundamental knowledge. Provide 4 options (A, B, C, D) and indicate the correct answer."
+        return f"Generate a {request.level} level variable multiple choice question about {concept} in {request.topic}. The question should test application and problem-solving skills. Provide 4 options (A, B, C, D) and indicate the correct answer."
     
-    def _generate_ai_question(self, request: QuestionRequest, core_type: str, concepts: List[str], index: int) -> Dict[str, Any]:
-        """Generate question using actual AI models"""
-        try:
-            # Use concept from shuffled list
-            concept = concepts[index % len(concepts)]
-            
-            # Generate question using AI model
-            if core_type == "baseline":
-                prompt = f"Generate a {request.level} level baseline multiple choice question about {concept} in {request.topic}. The question should test fundamental knowledge. Provide 4 options (A, B, C, D) and indicate the correct answer."
-            else:
-                prompt = f"Generate a {request.level} level variable multiple choice question about {concept} in {request.topic}. The question should test application and problem-solving skills. Provide 4 options (A, B, C, D) and indicate the correct answer."
-            
-            # Generate question using T5 model
-            result = self.question_generator(
-                prompt,
-                max_length=300,
-                num_return_sequences=1,
-                temperature=0.8
+    def _generate_ai_questions(self, requests: List[QuestionRequest], core_types: List[str], concepts: List[str], templates: List[str]) -> List[Dict[str, Any]]:
+        """Generate all questions using actual AI models in a single batched call; requests holds the owning request of each question"""
+        num_questions = len(core_types)
+        
+        # Serve previously generated questions for the same inputs from the cache. Concepts repeat once a
+        # quiz outgrows them, so each repeat within a request gets its own key instead of a duplicate question
+        occurrences = Counter()
+        cache_keys = []
+        for i in range(num_questions):
+            inputs = (requests[i].topic, requests[i].level, concepts[i], core_types[i])
+            occurrence = occurrences[(id(requests[i]), inputs)]
+            occurrences[(id(requests[i]), inputs)] += 1
+            cache_keys.append(QuestionCache.make_key(*inputs, occurrence))
+        questions_data: List[Dict[str, Any]] = [self.question_cache.get(key) for key in cache_keys]
+        misses = [i for i, data in enumerate(questions_data) if data is None]
+        
+        prompts = [self._build_ai_prompt(requests[i], core_types[i], concepts[i]) for i in misses]
+        
+        parse_jobs = []
+        if prompts:
+            try:
+                # Parse each finished batch on the parser thread while the next batch generates
+                for batch, texts in self._iter_generated_batches(
+                    prompts,
+                    _QUESTION_GENERATION_KWARGS,
+                    stopping_criteria=StoppingCriteriaList([
+                        _QuestionStoppingCriteria(self.question_generator.tokenizer)
+                    ])
+                ):
+                    indices = [misses[j] for j in batch]
+                    parse_jobs.append((indices, self._parse_executor.submit(
+                        self._parse_ai_batch, texts, [(concepts[i], requests[i].topic, requests[i].level) for i in indices]
+                    )))
+            except Exception as e:
+                logger.error(f"AI question generation failed: {e}")
+        
+        generated_indices = []
+        for indices, job in parse_jobs:
+            for i, data in zip(indices, job.result()):
+                questions_data[i] = data
+                if data:
+                    generated_indices.append(i)
+        
+        # Explain every newly generated question with one more batched call
+        explanations = self._generate_explanations([
+            (questions_data[i]["correct"], concepts[i], requests[i].topic, requests[i].level)
+            for i in generated_indices
+        ])
+        for i, explanation in zip(generated_indices, explanations):
+            if explanation:
+                questions_data[i]["explanation"] = explanation
+            self.question_cache.set(cache_keys[i], questions_data[i])
+        
+        # Fallback for every question whose generation or parsing failed
+        failed = [i for i, data in enumerate(questions_data) if not data]
+        if failed:
+            fallback_data = self._generate_fallback_questions(
+                [requests[i] for i in failed],
+                [core_types[i] for i in failed],
+                [concepts[i] for i in failed],
+                [templates[i] for i in failed]
             )
-            
-            generated_text = result[0]["generated_text"]
-            
-            # Parse the AI-generated question
-            parsed = self._parse_ai_generated_question(generated_text)
-            
-            if not parsed:
-                # Fallback if parsing fails
-                return self._generate_fallback_question(request, core_type, concepts, index)
-            
-            return parsed
-            
-        except Exception as e:
-            logger.error(f"AI question generation failed: {e}")
-            return self._generate_fallback_question(request, core_type, concepts, index)
+            for i, data in zip(failed, fallback_data):
+                questions_data[i] = data
+        
+        return questions_data
     
-    def _parse_ai_generated_question(self, generated_text: str) -> Optional[Dict[str, Any]]:
+    def _parse_ai_generated_question(self, generated_text: str, concept: str, topic: str, level: str) -> Optional[Dict[str, Any]]:
         """Parse AI-generated question into structured format"""
         try:
-            # Look for question pattern
-            question_match = re.search(r'(.+?)\s*[A-D][\).]', generated_text, re.DOTALL)
-            if not question_match:
+            # Find the answer line first so it never leaks into the last option
+            answer_match = _ANSWER_RE.search(generated_text)
+            body_end = answer_match.start() if answer_match else len(generated_text)
+            
+            # Single linear scan over option markers like "A) text" or "A. text"
+            markers = list(_OPTION_MARKER_RE.finditer(generated_text, 0, body_end))
+            if not markers:
                 return None
             
-            question = question_match.group(1).strip()
+            question = generated_text[:markers[0].start()].strip()
+            if not question:
+                return None
             
-            # Extract options
+            # Each option runs from its marker to the next one
             options = {}
-            correct_answer = None
-            
-            # Pattern to match options like "A) option text" or "A. option text"
-            option_pattern = r'([A-D])[\).]\s*([^A-D]+?)(?=[A-D][\).]|$)'
-            option_matches = re.findall(option_pattern, generated_text, re.DOTALL)
-            
-            for letter, text in option_matches:
-                options[letter] = text.strip()
+            for marker, next_marker in zip(markers, markers[1:] + [None]):
+                text_end = next_marker.start() if next_marker else body_end
+                options[marker.group(1)] = generated_text[marker.end():text_end].strip()
             
-            # Try to find correct answer
-            correct_pattern = r'(?:correct answer|answer:?\s*|correct:?\s*)([A-D])'
-            correct_match = re.search(correct_pattern, generated_text.lower())
-            if correct_match:
-                correct_answer = correct_match.group(1).upper()
-            elif len(options) >= 1:
+            answer_letter = answer_match.group(1).upper() if answer_match else None
+            if answer_letter in options:
+                correct_answer = answer_letter
+            else:
                 # Default to first option if not found
-                correct_answer = list(options.keys())[0]
+                correct_answer = next(iter(options))
             
             if not options or len(options) < 2:
                 return None
             
-            # Generate explanation using AI model
-            explanation_result = self.question_generator(
-                f"Explain why {correct_answer} is the correct answer for this {concept} question about {topic} at {level} level.",
-                max_length=150,
-                num_return_sequences=1,
-                temperature=0.7
-            )
-            
-            explanation = explanation_result[0]["generated_text"].strip()
-            
             return {
                 "question": question,
                 "options": options,
                 "correct": correct_answer,
-                "explanation": explanation
+                # Replaced by the batched AI explanation when one is generated
+                "explanation": f"The correct answer demonstrates proper understanding of {concept} in {topic} at {level} level."
             }
             
         except Exception as e:
             logger.error(f"Failed to parse AI generated question: {e}")
             return None
     
+    def _parse_ai_batch(self, texts: List[str], contexts: List[Tuple[str, str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """Parse one generated batch of texts with their (concept, topic, level); runs on the parser thread"""
+        return [
+            self._parse_ai_generated_question(text, concept, topic, level)
+            for text, (concept, topic, level) in zip(texts, contexts)
+        ]
+    
+    @functools.cached_property
+    def _parse_executor(self) -> ThreadPoolExecutor:
+        """Single worker that parses finished batches while the model keeps generating"""
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="quizhive-parse")
+    
+    def _generate_explanations(self, items: List[Tuple[str, str, str, str]]) -> List[Optional[str]]:
+        """Generate explanations for (correct, concept, topic, level) items in one batched call"""
+        if not items:
+            return []
+        
+        prompts = [
+            f"Explain why {correct_answer} is the correct answer for this {concept} question about {topic} at {level} level."
+            for correct_answer, concept, topic, level in items
+        ]
+        
+        try:
+            texts = self._generate_texts(prompts, _EXPLANATION_GENERATION_KWARGS)
+        except Exception as e:
+            logger.error(f"AI explanation generation failed: {e}")
+            return [None] * len(items)
+        
+        return [text.strip() or None for text in texts]
+    
+    def _generate_texts(self, prompts: List[str], generation_kwargs: Dict[str, Any], stopping_criteria=None) -> List[str]:
+        """Tokenize, generate and decode prompts batch by batch, returning texts in prompt order"""
+        texts: List[str] = [""] * len(prompts)
+        for batch, batch_texts in self._iter_generated_batches(prompts, generation_kwargs, stopping_criteria):
+            for i, text in zip(batch, batch_texts):
+                texts[i] = text
+        return texts
+    
+    def _iter_generated_batches(self, prompts: List[str], generation_kwargs: Dict[str, Any], stopping_criteria=None):
+        """Yield (prompt indices, decoded texts) for each generated batch as soon as it is ready"""
+        tokenizer = self.question_generator.tokenizer
+        model = self.question_generator.model
+        
+        # Sort prompts by length so each batch carries as little padding as possible
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        
+        for start in range(0, len(order), GENERATION_BATCH_SIZE):
+            batch = order[start:start + GENERATION_BATCH_SIZE]
+            encoded = tokenizer(
+                [prompts[i] for i in batch],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=128
+            ).to(model.device)
+            
+            with torch.inference_mode():
+                output_ids = model.generate(**encoded, stopping_criteria=stopping_criteria, **generation_kwargs)
+            
+            yield batch, tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+    
     def _get_concepts_for_topic(self, topic: str, level: str) -> List[str]:
         """Get concepts for a specific topic and level"""
         topic_lower = topic.lower()
         
         # Check if we have specific concepts for this topic
-        for key, concepts in self.topic_concept_generators.items():
-            if key in topic_lower or topic_lower in key:
-                return concepts.get(level, self.universal_concepts[level])
+        concepts = self._topic_lookup.get(topic_lower)
+        if concepts is None:
+            concepts = self._match_topic_concepts(topic_lower)
+        
+        if concepts:
+            return concepts.get(level, self.universal_concepts[level])
         
         # Fallback to universal concepts
         return self.universal_concepts[level]
     
-    def _generate_baseline_options(self, topic: str, concept: str, level: str) -> Dict[str, Any]:
+    def _find_topic_concepts(self, topic_lower: str) -> Optional[Dict[str, List[str]]]:
+        """Find the concept table whose key partially matches the topic"""
+        for key, concepts in self.topic_concept_generators.items():
+            if key in topic_lower or topic_lower in key:
+                return concepts
+        return None
+    
+    def _generate_baseline_options(self, topic: str, concept: str) -> Tuple[str, List[str]]:
         """Generate baseline question options"""
         correct_text = f"A fundamental {concept} concept in {topic} that provides essential functionality"
         
@@ -417,9 +880,9 @@ class AIQuestionGenerator:
             f"An external {concept} library not part of core {topic}"
         ]
         
-        return self._create_options_dict(correct_text, incorrect_options, concept, topic, level)
+        return correct_text, incorrect_options
     
-    def _generate_variable_options(self, topic: str, concept: str, level: str) -> Dict[str, Any]:
+    def _generate_variable_options(self, topic: str, concept: str) -> Tuple[str, List[str]]:
         """Generate variable question options"""
         correct_text = f"An advanced application of {concept} that solves complex {topic} problems efficiently"
         
@@ -429,49 +892,31 @@ class AIQuestionGenerator:
             f"A theoretical {concept} approach with no practical {topic} applications"
         ]
         
-        return self._create_options_dict(correct_text, incorrect_options, concept, topic, level)
+        return correct_text, incorrect_options
     
-    def _create_options_dict(self, correct_text: str, incorrect_options: List[str], concept: str, topic: str, level: str) -> Dict[str, Any]:
-        """Create options dictionary with correct and incorrect answers"""
-        # Create options dict
-        all_options = [correct_text] + incorrect_options
-        random.shuffle(all_options)
-        options = {}
-        for i, option_text in enumerate(all_options[:4]):
-            options[chr(65 + i)] = option_text  # A, B, C, D
-        
-        # Find correct answer
-        correct_letter = None
-        for letter, text in options.items():
-            if text == correct_text:
-                correct_letter = letter
-                break
-        
-        if not correct_letter:
-            correct_letter = list(options.keys())[0]
-        
-        explanation = f"The correct answer demonstrates proper understanding of {concept} in {topic} at {level} level."
-        
-        return {
-            "question": f"What is the most accurate description of {concept} in {topic}?",
-            "options": options,
-            "correct": correct_letter,
-            "explanation": explanation
-        }
+    def _build_all_options(self, correct_texts: List[str], incorrect_matrix: List[List[str]]) -> Tuple[List[Dict[str, str]], List[str]]:
+        """Shuffle the options of every question at once and record each correct letter"""
+        # Draw one permutation per question in a single call; position 0 holds the correct text
+        permutations = self._rng.choices(_OPTION_PERMUTATIONS, k=len(correct_texts))
+        
+        options_list = []
+        correct_letters = []
+        for correct_text, incorrect_options, permutation in zip(correct_texts, incorrect_matrix, permutations):
+            texts = (correct_text, *incorrect_options)
+            options_list.append({letter: texts[j] for letter, j in zip(_OPTION_LETTERS, permutation)})
+            correct_letters.append(_OPTION_LETTERS[permutation.index(0)])
+        
+        return options_list, correct_letters
     
-    def _determine_core_type(self, level: str, index: int, total_questions: int) -> str:
-        """Determine core type based on level and position with proper distribution"""
+    def _determine_core_types(self, level: str, total_questions: int) -> List[str]:
+        """Determine core types for all questions based on level with proper distribution"""
         distribution = self.core_distribution.get(level, {"baseline": 0.6, "variable": 0.4})
         
         # Calculate exact number of baseline questions
-        baseline_ratio = distribution["baseline"]
-        baseline_count = int(total_questions * baseline_ratio)
+        baseline_count = int(total_questions * distribution["baseline"])
         
         # First baseline_count questions should be baseline, rest variable
-        if index < baseline_count:
-            return "baseline"
-        else:
-            return "variable"
+        return ["baseline"] * baseline_count + ["variable"] * (total_questions - baseline_count)
     
     def generate_quiz(self, topic: str, level: str, num_questions: int, keywords: Optional[List[str]] = None, core_type: Optional[str] = None) -> Dict[str, Any]:
         """Generate a complete quiz"""
@@ -489,7 +934,7 @@ class AIQuestionGenerator:
             "topic": topic,
             "level": level,
             "total_questions": len(questions),
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": questions[0].generated_at if questions else datetime.now().isoformat(),
             "questions": [self._question_to_dict(q) for q in questions]
         }
     
@@ -519,7 +964,10 @@ def main():
     )
     
     print("Generated Quiz:")
-    print(json.dumps(quiz, indent=2))
+    if orjson is not None:
+        print(orjson.dumps(quiz, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(json.dumps(quiz, indent=2))
 
 
 if __name__ == "__main__":
@@ -6,45 +6,221 @@ Optimized for CPU execution on laptops
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+import orjson
+from cachetools import TTLCache
+from typing import List, Optional, Dict, Any, Literal
+import functools
 import json
 import logging
+import os
 import time
 import asyncio
+import queue
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from datetime import datetime
+from urllib.parse import unquote, urlsplit
 
-from ai_question_generator import AIQuestionGenerator, QuestionRequest
+from ai_question_generator import AIQuestionGenerator, QuestionRequest, CACHE_DIR, THREADS_PER_WORKER, set_generation_concurrency
+from response_cache import LLMCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Records are handed to a listener thread so request handlers never wait on log I/O
+_log_queue = queue.SimpleQueue()
+
+# Identical unhandled errors on the same path are logged at most once per second
+_recent_errors = TTLCache(maxsize=256, ttl=1)
+
+# Generation threads per worker, sized from the WEB_CONCURRENCY the launchers export
+GENERATION_THREADS = THREADS_PER_WORKER
+
+# Concurrent /generate-questions requests are coalesced into one model call
+MAX_BATCH = 16
+MAX_WAIT_SECONDS = 0.025
+
+# The most requested quizzes are regenerated in the background once their cached responses expire
+PREFETCH_INTERVAL_SECONDS = 600
+PREFETCH_TOP_K = 20
+REQUEST_COUNTS_LIMIT = 10000
+
 # Global variables for the generator
 question_generator = None
 generator_ready = False
+response_cache = None
+generation_executor = None
+generation_queue = None
+# (topic, level, num_questions, core_type, keywords) -> number of requests
+request_counts = Counter()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle"""
     # Startup
-    global question_generator, generator_ready
+    global question_generator, generator_ready, response_cache, generation_executor, generation_queue
+    # Root handlers only move behind the queue while the listener is running to drain it
+    root_logger = logging.getLogger()
+    log_handlers = root_logger.handlers
+    log_listener = QueueListener(_log_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    root_logger.handlers = [QueueHandler(_log_queue)]
     logger.info("Starting AI Question Generator Server...")
     
+    response_cache = LLMCache(maxsize=1024, ttl=3600, directory=CACHE_DIR / "responses")
+    # Generation is blocking, so it runs here instead of on the event loop
+    generation_executor = ThreadPoolExecutor(max_workers=GENERATION_THREADS, thread_name_prefix="generation")
+    
     try:
+        # Every generation thread runs the model at once, so each gets an equal share of the cores
+        set_generation_concurrency(GENERATION_THREADS)
         question_generator = AIQuestionGenerator()
+        # Compile and warm up before accepting traffic
+        question_generator.compile()
         generator_ready = True
         logger.info("Question generator initialized successfully")
     except Exception as e:
         logger.error(f"Failed to initialize question generator: {e}")
         generator_ready = False
     
+    # One batching consumer per generation thread keeps every thread busy
+    generation_queue = asyncio.Queue()
+    batch_workers = [asyncio.create_task(_batch_worker()) for _ in range(GENERATION_THREADS)]
+    prefetch_task = asyncio.create_task(_prefetch_loop())
+    
     yield
     
     # Shutdown
     logger.info("Shutting down AI Question Generator Server...")
+    prefetch_task.cancel()
+    for worker in batch_workers:
+        worker.cancel()
+    generation_executor.shutdown(wait=False, cancel_futures=True)
+    response_cache.close()
+    root_logger.handlers = log_handlers
+    log_listener.stop()
+
+
+async def _batch_worker():
+    """Drain queued generation requests in batches and resolve their futures"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await generation_queue.get()]
+        
+        # Collect whatever else arrives within the batching window
+        deadline = loop.time() + MAX_WAIT_SECONDS
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(generation_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            results = await loop.run_in_executor(
+                generation_executor, question_generator.generate_questions_batch, [item[0] for item in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        
+        for (_, future), questions in zip(batch, results):
+            if not future.done():
+                future.set_result(questions)
+
+
+async def _generate_batched(question_request: QuestionRequest):
+    """Queue a request for the batch worker and wait for its questions"""
+    future = asyncio.get_running_loop().create_future()
+    await generation_queue.put((question_request, future))
+    return await future
+
+
+async def _prefetch_loop():
+    """Periodically warm the response cache with the most requested quizzes"""
+    while True:
+        await asyncio.sleep(PREFETCH_INTERVAL_SECONDS)
+        
+        # Forget the long tail so arbitrary topics cannot grow the counter without bound
+        if len(request_counts) > REQUEST_COUNTS_LIMIT:
+            popular = request_counts.most_common(REQUEST_COUNTS_LIMIT // 2)
+            request_counts.clear()
+            request_counts.update(dict(popular))
+        
+        if not generator_ready:
+            continue
+        
+        for (topic, level, num_questions, core_type, keywords), _ in request_counts.most_common(PREFETCH_TOP_K):
+            cache_key = LLMCache.make_key(topic, level, num_questions, core_type, list(keywords))
+            if cache_key in response_cache:
+                continue
+            
+            question_request = QuestionRequest(
+                topic=topic,
+                level=level,
+                num_questions=num_questions,
+                core_type=core_type,
+                keywords=list(keywords) or None
+            )
+            start_generation_time = time.time()
+            try:
+                questions = await _generate_batched(question_request)
+            except Exception as e:
+                logger.warning(f"Prefetch failed for {topic} ({level}): {e}")
+                continue
+            
+            generation_time = int((time.time() - start_generation_time) * 1000)
+            response_cache.set(cache_key, _build_quiz_response(question_request, questions, generation_time))
+
+
+def _restamp_cached_response(cached: Dict[str, Any], topic: str) -> Dict[str, Any]:
+    """Give a cached payload fresh question IDs and timestamp, and the caller's spelling of the topic"""
+    # Keys fold topic case and whitespace, so the stored topic may be another caller's spelling
+    question_ids = question_generator.reserve_question_ids(len(cached["questions"]))
+    return {
+        **cached,
+        "topic": topic,
+        "generated_at": datetime.now().isoformat(),
+        "questions": [
+            {**question, "id": question_id, "topic": topic}
+            for question, question_id in zip(cached["questions"], question_ids)
+        ]
+    }
+
+
+def _build_quiz_response(question_request: QuestionRequest, questions: List[Any], generation_time: int) -> Dict[str, Any]:
+    """Build the /generate-questions payload from generated questions"""
+    # The generator's own output is trusted, so it goes straight to orjson without model validation
+    return {
+        "topic": question_request.topic,
+        "level": question_request.level,
+        "total_questions": len(questions),
+        "generated_at": questions[0].generated_at if questions else "",
+        "questions": [
+            {
+                "id": q.id,
+                "core_type": q.core_type,
+                "level": q.level,
+                "topic": q.topic,
+                "question": q.question,
+                "options": q.options,
+                "correct": q.correct,
+                "explanation": q.explanation
+            }
+            for q in questions
+        ],
+        "generation_time_ms": generation_time
+    }
 
 
 # Create FastAPI app
@@ -52,7 +228,8 @@ app = FastAPI(
     title="AI Question Generator API",
     description="AI-powered question generation API for QuizHive",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -69,9 +246,9 @@ app.add_middleware(
 class QuestionGenerationRequest(BaseModel):
     """Request model for question generation"""
     topic: str = Field(..., description="Topic for question generation (e.g., AWS, Python, Docker)")
-    level: str = Field(..., description="Difficulty level: beginner, intermediate, advanced")
+    level: Literal["beginner", "intermediate", "advanced"] = Field(..., description="Difficulty level: beginner, intermediate, advanced")
     num_questions: int = Field(..., ge=1, le=50, description="Number of questions to generate (1-50)")
-    core_type: Optional[str] = Field(None, description="Core type: baseline or variable")
+    core_type: Optional[Literal["baseline", "variable"]] = Field(None, description="Core type: baseline or variable")
     keywords: Optional[List[str]] = Field(None, description="Additional keywords to focus on")
 
 
@@ -111,9 +288,40 @@ class TopicListResponse(BaseModel):
     levels: List[str]
 
 
+class BatchSubRequest(BaseModel):
+    """One API call inside a batch"""
+    method: Literal["GET", "POST"] = Field(..., description="HTTP method of the sub-request")
+    path: str = Field(..., description="Endpoint path, e.g. /generate-questions")
+    body: Optional[Any] = Field(None, description="JSON body for POST sub-requests")
+
+
+class BatchRequest(BaseModel):
+    """Request model for running several API calls in one round trip"""
+    requests: List[BatchSubRequest] = Field(..., min_length=1, max_length=20, description="Sub-requests (1-20)")
+
+
 # Global start time
 start_time = time.time()
 
+# Static payloads, built once and shared by every request
+_TOPICS_PAYLOAD = TopicListResponse(
+    topics=["Any topic supported - AI generates concepts dynamically"],
+    levels=["beginner", "intermediate", "advanced"]
+).model_dump()
+_HEALTH_VERSION = "2.0.0"
+_STATS_TEMPLATE = {
+    "available_topics": ("Any topic supported - AI generates concepts dynamically",),
+    "supported_levels": ("beginner", "intermediate", "advanced"),
+    "max_questions_per_request": 50,
+    "generator_type": "AI-powered with fallback templates"
+}
+
+# Question validation rules
+_REQUIRED_FIELDS = ("id", "core_type", "level", "topic", "question", "options", "correct", "explanation")
+_REQUIRED = frozenset(_REQUIRED_FIELDS)
+_VALID_CORE_TYPES = frozenset(("baseline", "variable"))
+_VALID_LEVELS = frozenset(("beginner", "intermediate", "advanced"))
+
 
 @app.get("/", response_model=Dict[str, str])
 async def root():
@@ -128,13 +336,13 @@ async def root():
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    uptime = time.time() - start_time
-    return HealthResponse(
-        status="healthy" if generator_ready else "initializing",
-        generator_ready=generator_ready,
-        version="2.0.0",
-        uptime_seconds=uptime
-    )
+    # Load balancers poll this often, so only the live fields are computed per call
+    return ORJSONResponse({
+        "status": "healthy" if generator_ready else "initializing",
+        "generator_ready": generator_ready,
+        "version": _HEALTH_VERSION,
+        "uptime_seconds": time.time() - start_time
+    })
 
 
 @app.get("/topics", response_model=TopicListResponse)
@@ -143,13 +351,7 @@ async def get_available_topics():
     if not generator_ready:
         raise HTTPException(status_code=503, detail="Question generator not ready")
     
-    topics = ["Any topic supported - AI generates concepts dynamically"]
-    levels = ["beginner", "intermediate", "advanced"]
-    
-    return TopicListResponse(
-        topics=topics,
-        levels=levels
-    )
+    return ORJSONResponse(_TOPICS_PAYLOAD)
 
 
 @app.post("/generate-questions", response_model=QuizGenerationResponse)
@@ -161,18 +363,19 @@ async def generate_questions(request: QuestionGenerationRequest):
     start_generation_time = time.time()
     
     try:
-        # Validate inputs
-        if request.level not in ["beginner", "intermediate", "advanced"]:
-            raise HTTPException(
-                status_code=400, 
-                detail="Level must be one of: beginner, intermediate, advanced"
-            )
+        # Popularity drives the background prefetch
+        request_counts[(
+            request.topic, request.level, request.num_questions, request.core_type, tuple(sorted(request.keywords or []))
+        )] += 1
         
-        if request.core_type and request.core_type not in ["baseline", "variable"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Core type must be one of: baseline, variable"
-            )
+        # Identical requests within the TTL are served from the response cache
+        cache_key = LLMCache.make_key(
+            request.topic, request.level, request.num_questions, request.core_type, request.keywords
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            response = _restamp_cached_response(cached, request.topic)
+            return ORJSONResponse({**response, "generation_time_ms": int((time.time() - start_generation_time) * 1000)})
         
         # Create question request
         question_request = QuestionRequest(
@@ -184,39 +387,48 @@ async def generate_questions(request: QuestionGenerationRequest):
         )
         
         # Generate questions
-        questions = question_generator.generate_questions(question_request)
+        questions = await _generate_batched(question_request)
         
         # Calculate generation time
         generation_time = int((time.time() - start_generation_time) * 1000)
         
-        # Convert to response format
-        question_responses = []
-        for q in questions:
-            question_responses.append(QuestionResponse(
-                id=q.id,
-                core_type=q.core_type,
-                level=q.level,
-                topic=q.topic,
-                question=q.question,
-                options=q.options,
-                correct=q.correct,
-                explanation=q.explanation
-            ))
-        
-        return QuizGenerationResponse(
-            topic=request.topic,
-            level=request.level,
-            total_questions=len(question_responses),
-            generated_at=questions[0].__dict__.get('generated_at', '') if questions else '',
-            questions=question_responses,
-            generation_time_ms=generation_time
-        )
+        response = _build_quiz_response(question_request, questions, generation_time)
+        response_cache.set(cache_key, response)
+        return ORJSONResponse(response)
         
     except Exception as e:
         logger.error(f"Error generating questions: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating questions: {str(e)}")
 
 
+@app.post("/generate-questions/stream")
+async def generate_questions_stream(request: QuestionGenerationRequest):
+    """Stream generated questions as NDJSON, one question per line as each batch finishes"""
+    if not generator_ready:
+        raise HTTPException(status_code=503, detail="Question generator not ready")
+    
+    question_request = QuestionRequest(
+        topic=request.topic,
+        level=request.level,
+        num_questions=request.num_questions,
+        core_type=request.core_type,
+        keywords=request.keywords
+    )
+    
+    return StreamingResponse(_stream_questions(question_request), media_type="application/x-ndjson")
+
+
+async def _stream_questions(question_request: QuestionRequest):
+    """Advance the blocking question iterator on the generation pool and encode each question"""
+    loop = asyncio.get_running_loop()
+    questions = question_generator.iter_questions(question_request)
+    while True:
+        question = await loop.run_in_executor(generation_executor, next, questions, None)
+        if question is None:
+            break
+        yield orjson.dumps(question) + b"\n"
+
+
 @app.post("/generate-quiz")
 async def generate_quiz(request: QuestionGenerationRequest):
     """Generate a complete quiz (alternative endpoint)"""
@@ -225,14 +437,18 @@ async def generate_quiz(request: QuestionGenerationRequest):
         raise HTTPException(status_code=503, detail="Question generator not ready")
     
     try:
-        quiz = question_generator.generate_quiz(
-            topic=request.topic,
-            level=request.level,
-            num_questions=request.num_questions,
-            keywords=request.keywords
+        quiz = await asyncio.get_running_loop().run_in_executor(
+            generation_executor,
+            functools.partial(
+                question_generator.generate_quiz,
+                topic=request.topic,
+                level=request.level,
+                num_questions=request.num_questions,
+                keywords=request.keywords
+            )
         )
         
-        return quiz
+        return ORJSONResponse(quiz)
         
     except Exception as e:
         logger.error(f"Error generating quiz: {e}")
@@ -245,77 +461,153 @@ async def get_generation_stats():
     if not generator_ready:
         raise HTTPException(status_code=503, detail="Question generator not ready")
     
-    uptime = time.time() - start_time
-    
+    # Monitoring scrapes this often; only the live fields are computed per call
     return {
-        "uptime_seconds": uptime,
+        **_STATS_TEMPLATE,
+        "uptime_seconds": time.time() - start_time,
         "generator_ready": generator_ready,
-        "available_topics": ["Any topic supported - AI generates concepts dynamically"],
-        "supported_levels": ["beginner", "intermediate", "advanced"],
-        "max_questions_per_request": 50,
-        "generator_type": "AI-powered with fallback templates",
-        "models_loaded": question_generator.models_loaded
+        "models_loaded": question_generator.models_loaded,
+        **response_cache.stats()
     }
 
 
+def _check_options(options: Any, correct: Any) -> Optional[str]:
+    """Return the options issue of a single question, if any"""
+    if not isinstance(options, dict):
+        return "Options must be a dictionary"
+    if len(options) != 4:
+        return "Must have exactly 4 options"
+    # Check if correct answer exists in options
+    if correct and correct not in options:
+        return f"Correct answer '{correct}' not found in options"
+    return None
+
+
 @app.post("/validate-questions")
 async def validate_questions(questions: List[Dict[str, Any]]):
     """Validate generated questions for quality"""
     if not generator_ready:
         raise HTTPException(status_code=503, detail="Question generator not ready")
     
-    validation_results = []
+    # Column-wise layout: each rule is one pass over a single field of every question.
+    # Absent fields default to a valid value since they are reported as missing instead.
+    # A complete question passes with one set comparison; field order only matters for reporting
+    missing_fields = [
+        () if question.keys() >= _REQUIRED else [field for field in _REQUIRED_FIELDS if field not in question]
+        for question in questions
+    ]
+    core_types = [question.get("core_type", "baseline") for question in questions]
+    levels = [question.get("level", "beginner") for question in questions]
+    
+    invalid_core_types = [not (isinstance(value, str) and value in _VALID_CORE_TYPES) for value in core_types]
+    invalid_levels = [not (isinstance(value, str) and value in _VALID_LEVELS) for value in levels]
+    option_issues = [
+        _check_options(question["options"], question.get("correct")) if "options" in question else None
+        for question in questions
+    ]
     
-    for i, question in enumerate(questions):
+    # Combine the rule masks first; issue strings are only built for invalid questions
+    valid_mask = [
+        not (missing or option_issue or invalid_core_type or invalid_level)
+        for missing, option_issue, invalid_core_type, invalid_level
+        in zip(missing_fields, option_issues, invalid_core_types, invalid_levels)
+    ]
+    
+    validation_results = []
+    for i, (question, is_valid) in enumerate(zip(questions, valid_mask)):
         issues = []
-        
-        # Check required fields
-        required_fields = ["id", "core_type", "level", "topic", "question", "options", "correct", "explanation"]
-        for field in required_fields:
-            if field not in question:
-                issues.append(f"Missing required field: {field}")
-        
-        # Validate options
-        if "options" in question:
-            options = question["options"]
-            if not isinstance(options, dict):
-                issues.append("Options must be a dictionary")
-            elif len(options) != 4:
-                issues.append("Must have exactly 4 options")
-            else:
-                # Check if correct answer exists in options
-                correct = question.get("correct")
-                if correct and correct not in options:
-                    issues.append(f"Correct answer '{correct}' not found in options")
-        
-        # Validate core_type
-        if "core_type" in question:
-            if question["core_type"] not in ["baseline", "variable"]:
+        if not is_valid:
+            issues = [f"Missing required field: {field}" for field in missing_fields[i]]
+            if option_issues[i]:
+                issues.append(option_issues[i])
+            if invalid_core_types[i]:
                 issues.append("Core type must be 'baseline' or 'variable'")
-        
-        # Validate level
-        if "level" in question:
-            if question["level"] not in ["beginner", "intermediate", "advanced"]:
+            if invalid_levels[i]:
                 issues.append("Level must be 'beginner', 'intermediate', or 'advanced'")
         
         validation_results.append({
             "question_index": i,
             "question_id": question.get("id", f"question_{i}"),
-            "is_valid": len(issues) == 0,
+            "is_valid": is_valid,
             "issues": issues
         })
     
     return {
         "total_questions": len(questions),
-        "valid_questions": sum(1 for r in validation_results if r["is_valid"]),
+        "valid_questions": sum(valid_mask),
         "validation_results": validation_results
     }
 
 
+async def _call_route(method: str, path: str, body: Any) -> Dict[str, Any]:
+    """Run one sub-request through the app's own ASGI stack and capture its status and JSON body"""
+    payload = orjson.dumps(body) if body is not None else b""
+    # Routing matches on the path alone, so any query string goes in its own scope field
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": unquote(url.path),
+        "raw_path": url.path.encode("utf-8"),
+        "root_path": "",
+        "query_string": url.query.encode("utf-8"),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode("ascii"))],
+        "client": None,
+        "server": None
+    }
+    request_messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    
+    async def receive():
+        if request_messages:
+            return request_messages.pop()
+        # The caller never disconnects; block until the route is done with us
+        await asyncio.Event().wait()
+    
+    status_code = 500
+    chunks = []
+    
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+    
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware re-raises after sending its 500; keep the failure to this sub-request
+        status_code = 500
+        if not chunks:
+            chunks.append(orjson.dumps({"error": "Internal server error", "status_code": 500}))
+    
+    content = b"".join(chunks)
+    try:
+        response_body = orjson.loads(content) if content else None
+    except orjson.JSONDecodeError:
+        response_body = content.decode("utf-8", "replace")
+    return {"status_code": status_code, "body": response_body}
+
+
+@app.post("/batch")
+async def batch(request: BatchRequest):
+    """Run several API calls in one round trip; responses come back in request order"""
+    if any(unquote(urlsplit(sub_request.path).path).rstrip("/") == "/batch" for sub_request in request.requests):
+        raise HTTPException(status_code=400, detail="Batches cannot contain /batch")
+    
+    responses = await asyncio.gather(*(
+        _call_route(sub_request.method, sub_request.path, sub_request.body) for sub_request in request.requests
+    ))
+    return ORJSONResponse({"responses": responses})
+
+
 # Exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "status_code": exc.status_code}
     )
@@ -323,21 +615,31 @@ async def http_exception_handler(request, exc):
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    error_key = (type(exc).__name__, request.url.path)
+    if error_key not in _recent_errors:
+        _recent_errors[error_key] = True
+        logger.error("Unhandled exception on %s", request.url.path, exc_info=exc)
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error", "status_code": 500}
     )
 
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     
-    # Run the server
+    # One worker process per core; exported so each worker sizes its threads for the same count
+    workers = int(os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    
+    # Run the server across all worker processes on the C-backed loop and HTTP parser when installed
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
-        log_level="info"
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        access_log=False,
+        log_level="warning"
     )
@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration for production serving
+Run from model_server: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+bind = "0.0.0.0:8001"
+
+# One worker process per core; override with WEB_CONCURRENCY. Exported so the
+# generator sizes its per-worker threads for the same count.
+workers = int(os.environ.setdefault("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app once in the master so workers share its pages copy-on-write.
+# The generator itself is still created per worker in the app lifespan.
+preload_app = True
+
+# Model loading on first start can take a while
+timeout = 120
+graceful_timeout = 30
@@ -0,0 +1,90 @@
+"""
+Response cache for the question generation API
+Serves repeated generation requests without running the generator again
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from cachetools import TTLCache
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_topic(topic: str) -> str:
+    """Fold case and whitespace so near-identical topic strings share a key"""
+    return _WHITESPACE_RE.sub(" ", topic).strip().casefold()
+
+
+class LLMCache:
+    """Generation responses keyed by the normalized request: an in-process TTL cache over an optional disk cache"""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600, directory: Optional[Path] = None,
+                 disk_ttl: Optional[int] = None, disk_size_limit: int = 2 ** 30):
+        self._responses = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Both tiers expire together unless the disk tier is given its own TTL
+        self.disk_ttl = ttl if disk_ttl is None else disk_ttl
+        # The disk tier survives restarts when diskcache is installed
+        self._disk = diskcache.Cache(str(directory), size_limit=disk_size_limit) if diskcache and directory else None
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    @staticmethod
+    def make_key(topic: str, level: str, num_questions: int, core_type: Optional[str], keywords: Optional[List[str]]) -> str:
+        """Hash the normalized request into a cache key"""
+        raw = json.dumps({
+            "topic": normalize_topic(topic),
+            "level": level,
+            "num_questions": num_questions,
+            "core_type": core_type,
+            "keywords": sorted(keywords or [])
+        }, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response, or None"""
+        response = self._responses.get(key)
+        if response is None and self._disk is not None:
+            response = self._disk.get(key)
+            if response is not None:
+                # Keep hot keys in memory after a disk hit
+                self._responses[key] = response
+                self.disk_hits += 1
+
+        if response is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return response
+
+    def __contains__(self, key: str) -> bool:
+        """Check for a cached response without touching the hit counters"""
+        return key in self._responses or (self._disk is not None and key in self._disk)
+
+    def set(self, key: str, response: Dict[str, Any]):
+        """Store a response in memory and on disk"""
+        self._responses[key] = response
+        if self._disk is not None:
+            self._disk.set(key, response, expire=self.disk_ttl)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters since startup"""
+        return {
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "disk_hits": self.disk_hits
+        }
+
+    def close(self):
+        """Close the disk tier"""
+        if self._disk is not None:
+            self._disk.close()
@@ -4,15 +4,264 @@ Generates questions using templates and patterns extracted from existing questio
 Optimized for CPU-based execution on laptops
 """
 
+import functools
+import itertools
 import json
 import random
 import re
-from typing import Dict, List, Any, Optional
+import sys
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
-@dataclass
+# Placeholders filled by _fill_template, matched in a single pass
+PLACEHOLDERS = ("service", "concept", "scenario", "function", "pattern", "feature", "keyword")
+_PLACEHOLDER_RE = re.compile(r"\{(" + "|".join(PLACEHOLDERS) + r")\}")
+
+_LETTERS = ("A", "B", "C", "D")
+
+# All 24 orderings of (correct, incorrect x3) over A-D, each with the letter the correct text lands on
+_OPTION_ORDERS = tuple((perm, _LETTERS[perm.index(0)]) for perm in itertools.permutations(range(4)))
+
+# Predefined question templates for common technical topics
+_TOPIC_TEMPLATES = {
+    "AWS": {
+        "beginner": (
+            "What is {service} used for in AWS?",
+            "Which of the following best describes {service}?",
+            "How does {service} work in the AWS cloud?",
+            "What is the primary purpose of {service}?",
+            "When should you use {service}?"
+        ),
+        "intermediate": (
+            "How do you configure {service} for {scenario}?",
+            "What are the key differences between {service1} and {service2}?",
+            "Which {service} feature would you use for {scenario}?",
+            "How does {service} integrate with other AWS services?",
+            "What is the best practice for implementing {service}?"
+        ),
+        "advanced": (
+            "How would you optimize {service} for {scenario}?",
+            "What are the security implications of using {service}?",
+            "Design a solution using {service} for {complex_scenario}.",
+            "How do you troubleshoot common issues with {service}?",
+            "What are the performance characteristics of {service}?"
+        )
+    },
+    "Python": {
+        "beginner": (
+            "What is the purpose of {concept} in Python?",
+            "How do you use {function} in Python?",
+            "Which data type would you use for {scenario}?",
+            "What does the {keyword} keyword do in Python?",
+            "How do you create a {structure} in Python?"
+        ),
+        "intermediate": (
+            "How would you implement {pattern} in Python?",
+            "What is the difference between {concept1} and {concept2}?",
+            "How do you handle {scenario} using Python's {feature}?",
+            "Which Python module would you use for {task}?",
+            "How do you optimize {operation} in Python?"
+        ),
+        "advanced": (
+            "How does Python's {mechanism} work internally?",
+            "Design a {architecture} using Python's {feature}.",
+            "What are the performance implications of using {technique}?",
+            "How would you implement {advanced_pattern} in Python?",
+            "What are the memory considerations when using {feature}?"
+        )
+    },
+    "Docker": {
+        "beginner": (
+            "What is a {docker_concept}?",
+            "How do you create a {docker_object}?",
+            "What is the purpose of {docker_instruction}?",
+            "Which Docker command would you use for {action}?",
+            "What is the difference between {concept1} and {concept2}?"
+        ),
+        "intermediate": (
+            "How do you optimize {docker_object} for {scenario}?",
+            "What is the best way to {action} using Docker?",
+            "How would you implement {pattern} with Docker?",
+            "What are the security considerations for {docker_feature}?",
+            "How do you troubleshoot {docker_issue}?"
+        ),
+        "advanced": (
+            "Design a {architecture} using Docker and {technology}.",
+            "How would you implement {advanced_pattern} with Docker?",
+            "What are the performance characteristics of {docker_feature}?",
+            "How do you scale {docker_object} for {scenario}?",
+            "What are the networking implications of {docker_setup}?"
+        )
+    }
+}
+
+# Technical terms and concepts for different domains
+_TECHNICAL_CONCEPTS = {
+    "AWS": {
+        "services": ("EC2", "S3", "Lambda", "RDS", "VPC", "IAM", "CloudFormation", "API Gateway", "SQS", "SNS"),
+        "concepts": ("scalability", "high availability", "security", "cost optimization", "performance", "durability"),
+        "scenarios": ("web hosting", "data storage", "serverless computing", "database management", "networking", "monitoring")
+    },
+    "Python": {
+        "concepts": ("list comprehension", "decorator", "generator", "context manager", "metaclass", "async/await"),
+        "functions": ("print", "len", "range", "enumerate", "zip", "map", "filter", "reduce"),
+        "data_types": ("list", "tuple", "dict", "set", "str", "int", "float"),
+        "keywords": ("def", "class", "import", "from", "if", "for", "while", "try", "except"),
+        "structures": ("function", "class", "module", "package", "list", "dictionary")
+    },
+    "Docker": {
+        "concepts": ("container", "image", "volume", "network", "service", "stack"),
+        "instructions": ("FROM", "RUN", "COPY", "ADD", "CMD", "ENTRYPOINT", "WORKDIR", "EXPOSE"),
+        "objects": ("Dockerfile", "docker-compose.yml", "container", "image", "volume"),
+        "commands": ("build", "run", "push", "pull", "exec", "logs", "ps", "stop")
+    }
+}
+
+# Generic templates when no topic-specific templates are found
+_GENERIC_TEMPLATES = {
+    "beginner": (
+        "What is {concept}?",
+        "How do you use {concept}?",
+        "What is the purpose of {concept}?",
+        "Which of the following describes {concept}?",
+        "When would you use {concept}?"
+    ),
+    "intermediate": (
+        "How does {concept} work?",
+        "What are the benefits of {concept}?",
+        "How would you implement {concept}?",
+        "What is the difference between {concept} and {alternative}?",
+        "What are the best practices for {concept}?"
+    ),
+    "advanced": (
+        "How would you optimize {concept}?",
+        "What are the advanced features of {concept}?",
+        "Design a solution using {concept}.",
+        "What are the trade-offs of using {concept}?",
+        "How does {concept} compare to alternatives?"
+    )
+}
+
+# Question starters and patterns
+_QUESTION_STARTERS = (
+    "What is",
+    "Which of the following",
+    "How does",
+    "Why is",
+    "When should you",
+    "Where can you",
+    "What are the benefits of",
+    "What is the purpose of",
+    "How do you",
+    "Which statement best describes"
+)
+
+# Option pools per upper-cased topic
+_CORRECT_POOLS = {
+    "AWS": (
+        "Provides scalable virtual servers in the cloud",
+        "Offers object storage with high durability",
+        "Enables serverless computing without provisioning servers",
+        "Manages relational databases with automated backups"
+    ),
+    "PYTHON": (
+        "A built-in function that performs the specified operation",
+        "A data structure that stores multiple values in an ordered sequence",
+        "A keyword that defines a reusable block of code",
+        "A method that processes each item in an iterable"
+    ),
+    "DOCKER": (
+        "A lightweight, standalone executable package that includes everything needed to run the application",
+        "A text file that contains instructions for building a Docker image",
+        "A storage mechanism that persists data generated by Docker containers",
+        "A virtual network that allows containers to communicate with each other"
+    )
+}
+_INCORRECT_POOLS = {
+    "AWS": (
+        "Manages user authentication and authorization",
+        "Provides content delivery network services",
+        "Monitors application performance and logs",
+        "Automates resource deployment and management"
+    ),
+    "PYTHON": (
+        "Compiles Python code to machine language",
+        "Manages memory allocation and garbage collection",
+        "Provides syntax highlighting and code completion",
+        "Handles network communication between services"
+    ),
+    "DOCKER": (
+        "Replaces virtual machines completely",
+        "Eliminates the need for operating systems",
+        "Provides automatic code compilation",
+        "Manages database transactions and queries"
+    )
+}
+_DEFAULT_INCORRECT_POOL = (
+    "An outdated approach that is no longer recommended",
+    "A complex solution that requires extensive configuration",
+    "A temporary workaround with limited functionality",
+    "An experimental feature with no production support"
+)
+# Relative difficulty of each incorrect option, aligned with _INCORRECT_POOLS; advanced quizzes favour the heavier ones
+_INCORRECT_WEIGHTS = {
+    "AWS": (1.0, 1.0, 0.75, 1.0),
+    "PYTHON": (0.75, 1.0, 0.5, 0.5),
+    "DOCKER": (1.0, 0.5, 0.5, 0.25)
+}
+
+# Upper-cased topic spellings -> canonical upper-cased topic
+_TOPIC_ALIASES = {
+    "AWS": "AWS",
+    "AMAZON": "AWS",
+    "AMAZON WEB SERVICES": "AWS",
+    "PYTHON": "PYTHON",
+    "PY": "PYTHON",
+    "PYTHON3": "PYTHON",
+    "PYTHON 3": "PYTHON",
+    "DOCKER": "DOCKER",
+    "CONTAINER": "DOCKER",
+    "CONTAINERS": "DOCKER"
+}
+
+
+def _interned(value):
+    """Recursively intern the strings of a nested dict/tuple constant"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, tuple):
+        return tuple(_interned(item) for item in value)
+    if isinstance(value, dict):
+        return {_interned(key): _interned(item) for key, item in value.items()}
+    return value
+
+
+# Intern every static pool string once, so dict hashing and option comparisons hit the identity fast path
+(_TOPIC_TEMPLATES, _TECHNICAL_CONCEPTS, _GENERIC_TEMPLATES, _QUESTION_STARTERS,
+ _CORRECT_POOLS, _INCORRECT_POOLS, _DEFAULT_INCORRECT_POOL) = map(_interned, (
+    _TOPIC_TEMPLATES, _TECHNICAL_CONCEPTS, _GENERIC_TEMPLATES, _QUESTION_STARTERS,
+    _CORRECT_POOLS, _INCORRECT_POOLS, _DEFAULT_INCORRECT_POOL))
+
+
+def _weighted_pick(pool: Tuple[str, ...], weights: Tuple[float, ...], w_max: float) -> str:
+    """Pick one item with probability proportional to its weight (Bernoulli race, no normalization pass)"""
+    while True:
+        i = random.randrange(len(pool))
+        if random.random() * w_max < weights[i]:
+            return pool[i]
+
+
+@dataclass(slots=True)
 class QuestionRequest:
     """Request structure for question generation"""
     topic: str
@@ -22,7 +271,7 @@ class QuestionRequest:
     keywords: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedQuestion:
     """Structure for generated questions"""
     id: str
@@ -36,46 +285,75 @@ class GeneratedQuestion:
 
 
 class TemplateQuestionGenerator:
-    def __init__(self, templates_path: str = "data/question_templates.json"):
+    def __init__(self, templates_path: str = "data/question_templates.json", template_sections: Optional[List[str]] = None):
         self.templates_path = templates_path
+        # Top-level sections of the templates file to keep; None keeps all of them
+        self.template_sections = frozenset(template_sections) if template_sections is not None else None
         self.templates = {}
         self.question_id_counter = 1000  # Start from 1000 to avoid conflicts
         self.load_templates()
         
         # Predefined question templates for different topics and levels
-        self.topic_templates = self._initialize_topic_templates()
+        self.topic_templates = _TOPIC_TEMPLATES
         
         # Technical terms and concepts for different domains
-        self.technical_concepts = self._initialize_technical_concepts()
+        self.technical_concepts = _TECHNICAL_CONCEPTS
+        
+        # Topic keys are mixed case ("AWS", "Python"); index them by their upper-cased form once
+        self._topic_keys_upper = {key.upper(): key for key in self.topic_templates}
+        self._topic_key_pairs = tuple(self._topic_keys_upper.items())
+        # Every known spelling of a topic resolves to its template key in one lookup
+        self._topic_aliases = {
+            alias: self._topic_keys_upper[canonical]
+            for alias, canonical in _TOPIC_ALIASES.items() if canonical in self._topic_keys_upper
+        }
+        self._concepts_by_topic_upper = {key.upper(): concepts for key, concepts in self.technical_concepts.items()}
         
         # Question starters and patterns
-        self.question_starters = [
-            "What is",
-            "Which of the following",
-            "How does",
-            "Why is",
-            "When should you",
-            "Where can you",
-            "What are the benefits of",
-            "What is the purpose of",
-            "How do you",
-            "Which statement best describes"
+        self.question_starters = _QUESTION_STARTERS
+        
+        # Explanation builders, called with (option, reason)
+        self.explanation_builders = [
+            lambda option, reason: f"This is the correct answer because {reason}.",
+            lambda option, reason: f"The correct choice is {option} as it {reason}.",
+            lambda option, reason: f"{option} is the right answer because {reason}.",
+            lambda option, reason: f"This option correctly describes {reason}.",
+            lambda option, reason: f"The answer is {option} because it {reason}."
         ]
         
-        # Explanation templates
-        self.explanation_templates = [
-            "This is the correct answer because {reason}.",
-            "The correct choice is {option} as it {reason}.",
-            "{option} is the right answer because {reason}.",
-            "This option correctly describes {reason}.",
-            "The answer is {option} because it {reason}."
-        ]
+        # Option pools per upper-cased topic
+        self._correct_pools = _CORRECT_POOLS
+        self._incorrect_pools = _INCORRECT_POOLS
+        self._default_incorrect_pool = _DEFAULT_INCORRECT_POOL
+        self._incorrect_weights = {topic: (weights, max(weights)) for topic, weights in _INCORRECT_WEIGHTS.items()}
+        
+        # The (topic, level) pair is fixed for a whole quiz, so its template lookup is memoized
+        self._cached_templates = functools.lru_cache(maxsize=256)(self._get_templates_for_topic_and_level)
+        
+        # Placeholder name -> picker returning its replacement, or None to leave it unfilled
+        self._placeholder_pickers = {
+            "service": lambda concepts, keywords: random.choice(concepts["services"]) if "services" in concepts else None,
+            "concept": lambda concepts, keywords: random.choice(concepts["concepts"]) if "concepts" in concepts else None,
+            "scenario": lambda concepts, keywords: random.choice(concepts["scenarios"]) if "scenarios" in concepts else None,
+            "function": lambda concepts, keywords: f"the {random.choice(('appropriate', 'correct', 'suitable'))} function",
+            "pattern": lambda concepts, keywords: f"{random.choice(('design', 'implementation', 'coding'))} pattern",
+            "feature": lambda concepts, keywords: f"the {random.choice(('main', 'key', 'primary'))} feature",
+            # Use keywords if provided
+            "keyword": lambda concepts, keywords: keywords[0] if keywords else None
+        }
     
     def load_templates(self):
         """Load templates from JSON file"""
         try:
-            with open(self.templates_path, 'r', encoding='utf-8') as f:
-                self.templates = json.load(f)
+            if ijson is not None:
+                # Stream the file so only the kept sections are ever built in memory
+                with open(self.templates_path, 'rb') as f:
+                    self.templates = self._stream_template_sections(f)
+            else:
+                with open(self.templates_path, 'r', encoding='utf-8') as f:
+                    self.templates = json.load(f)
+                if self.template_sections is not None:
+                    self.templates = {k: v for k, v in self.templates.items() if k in self.template_sections}
             print(f"Loaded templates from {self.templates_path}")
         except FileNotFoundError:
             print(f"Template file not found: {self.templates_path}")
@@ -84,185 +362,94 @@ class TemplateQuestionGenerator:
             print(f"Error loading templates: {e}")
             self.templates = {}
     
-    def _initialize_topic_templates(self) -> Dict[str, Dict]:
-        """Initialize predefined templates for common technical topics"""
-        return {
-            "AWS": {
-                "beginner": [
-                    "What is {service} used for in AWS?",
-                    "Which of the following best describes {service}?",
-                    "How does {service} work in the AWS cloud?",
-                    "What is the primary purpose of {service}?",
-                    "When should you use {service}?"
-                ],
-                "intermediate": [
-                    "How do you configure {service} for {scenario}?",
-                    "What are the key differences between {service1} and {service2}?",
-                    "Which {service} feature would you use for {scenario}?",
-                    "How does {service} integrate with other AWS services?",
-                    "What is the best practice for implementing {service}?"
-                ],
-                "advanced": [
-                    "How would you optimize {service} for {scenario}?",
-                    "What are the security implications of using {service}?",
-                    "Design a solution using {service} for {complex_scenario}.",
-                    "How do you troubleshoot common issues with {service}?",
-                    "What are the performance characteristics of {service}?"
-                ]
-            },
-            "Python": {
-                "beginner": [
-                    "What is the purpose of {concept} in Python?",
-                    "How do you use {function} in Python?",
-                    "Which data type would you use for {scenario}?",
-                    "What does the {keyword} keyword do in Python?",
-                    "How do you create a {structure} in Python?"
-                ],
-                "intermediate": [
-                    "How would you implement {pattern} in Python?",
-                    "What is the difference between {concept1} and {concept2}?",
-                    "How do you handle {scenario} using Python's {feature}?",
-                    "Which Python module would you use for {task}?",
-                    "How do you optimize {operation} in Python?"
-                ],
-                "advanced": [
-                    "How does Python's {mechanism} work internally?",
-                    "Design a {architecture} using Python's {feature}.",
-                    "What are the performance implications of using {technique}?",
-                    "How would you implement {advanced_pattern} in Python?",
-                    "What are the memory considerations when using {feature}?"
-                ]
-            },
-            "Docker": {
-                "beginner": [
-                    "What is a {docker_concept}?",
-                    "How do you create a {docker_object}?",
-                    "What is the purpose of {docker_instruction}?",
-                    "Which Docker command would you use for {action}?",
-                    "What is the difference between {concept1} and {concept2}?"
-                ],
-                "intermediate": [
-                    "How do you optimize {docker_object} for {scenario}?",
-                    "What is the best way to {action} using Docker?",
-                    "How would you implement {pattern} with Docker?",
-                    "What are the security considerations for {docker_feature}?",
-                    "How do you troubleshoot {docker_issue}?"
-                ],
-                "advanced": [
-                    "Design a {architecture} using Docker and {technology}.",
-                    "How would you implement {advanced_pattern} with Docker?",
-                    "What are the performance characteristics of {docker_feature}?",
-                    "How do you scale {docker_object} for {scenario}?",
-                    "What are the networking implications of {docker_setup}?"
-                ]
-            }
-        }
+    def _stream_template_sections(self, f) -> Dict[str, Any]:
+        """Build the kept top-level sections of a templates file from its parse events"""
+        templates = {}
+        section = None
+        builder = None
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "" and event in ("map_key", "end_map"):
+                # A top-level key ends the previous section and starts the next one
+                if builder is not None:
+                    templates[section] = builder.value
+                section = value if event == "map_key" else None
+                keep = section is not None and (self.template_sections is None or section in self.template_sections)
+                builder = ijson.ObjectBuilder() if keep else None
+            elif builder is not None:
+                builder.event(event, value)
+        return templates
     
-    def _initialize_technical_concepts(self) -> Dict[str, Dict]:
-        """Initialize technical concepts for different domains"""
-        return {
-            "AWS": {
-                "services": ["EC2", "S3", "Lambda", "RDS", "VPC", "IAM", "CloudFormation", "API Gateway", "SQS", "SNS"],
-                "concepts": ["scalability", "high availability", "security", "cost optimization", "performance", "durability"],
-                "scenarios": ["web hosting", "data storage", "serverless computing", "database management", "networking", "monitoring"]
-            },
-            "Python": {
-                "concepts": ["list comprehension", "decorator", "generator", "context manager", "metaclass", "async/await"],
-                "functions": ["print", "len", "range", "enumerate", "zip", "map", "filter", "reduce"],
-                "data_types": ["list", "tuple", "dict", "set", "str", "int", "float"],
-                "keywords": ["def", "class", "import", "from", "if", "for", "while", "try", "except"],
-                "structures": ["function", "class", "module", "package", "list", "dictionary"]
-            },
-            "Docker": {
-                "concepts": ["container", "image", "volume", "network", "service", "stack"],
-                "instructions": ["FROM", "RUN", "COPY", "ADD", "CMD", "ENTRYPOINT", "WORKDIR", "EXPOSE"],
-                "objects": ["Dockerfile", "docker-compose.yml", "container", "image", "volume"],
-                "commands": ["build", "run", "push", "pull", "exec", "logs", "ps", "stop"]
-            }
-        }
-    
-    def generate_questions(self, request: QuestionRequest) -> List[GeneratedQuestion]:
-        """Generate questions based on the request"""
-        questions = []
-        
+    def generate_questions(self, request: QuestionRequest) -> Iterator[GeneratedQuestion]:
+        """Generate questions based on the request, yielding them one at a time"""
         # Get templates for the topic and level
-        templates = self._get_templates_for_topic_and_level(request.topic, request.level)
+        templates = self._cached_templates(request.topic, request.level)
         
         if not templates:
             # If no specific templates found, use generic templates
             templates = self._get_generic_templates(request.level)
         
-        for i in range(request.num_questions):
-            question = self._generate_single_question(request, templates, i)
-            questions.append(question)
-        
-        return questions
+        # Case-fold the topic once for the whole quiz; aliases share their canonical topic's pools
+        topic_upper = request.topic.upper()
+        topic_upper = _TOPIC_ALIASES.get(topic_upper, topic_upper)
+        topic_lower = request.topic.lower()
+        
+        # Draw every per-question random choice up front, one batch call each
+        num_questions = request.num_questions
+        template_batch = random.choices(templates, k=num_questions)
+        correct_batch = self._sample_correct_options(topic_upper, topic_lower, request.level, num_questions)
+        reason_batch = random.choices(self._explanation_reasons(topic_lower), k=num_questions)
+        builder_batch = random.choices(self.explanation_builders, k=num_questions)
+        order_batch = random.choices(_OPTION_ORDERS, k=num_questions)
+        
+        # Format the whole ID block once and advance the counter so later quizzes don't reuse it
+        base_id = self.question_id_counter
+        question_ids = tuple(map("AI_GEN_{}".format, range(base_id, base_id + num_questions)))
+        self.question_id_counter = base_id + num_questions
+        
+        for i in range(num_questions):
+            yield self._generate_single_question(
+                request, topic_upper, topic_lower, template_batch[i], correct_batch[i], reason_batch[i], builder_batch[i],
+                order_batch[i], question_ids[i], i
+            )
     
-    def _get_templates_for_topic_and_level(self, topic: str, level: str) -> List[str]:
+    def _get_templates_for_topic_and_level(self, topic: str, level: str) -> Tuple[str, ...]:
         """Get templates for a specific topic and level"""
         topic_upper = topic.upper()
         
-        if topic_upper in self.topic_templates and level in self.topic_templates[topic_upper]:
-            return self.topic_templates[topic_upper][level]
+        key = self._topic_aliases.get(topic_upper) or self._topic_keys_upper.get(topic_upper)
+        if key is not None and level in self.topic_templates[key]:
+            return self.topic_templates[key][level]
         
-        # Try to find partial matches
-        for key in self.topic_templates:
-            if topic.upper() in key.upper() or key.upper() in topic.upper():
+        # Unlisted spellings fall back to partial matches; _cached_templates memoizes the result
+        for key_upper, key in self._topic_key_pairs:
+            if topic_upper in key_upper or key_upper in topic_upper:
                 if level in self.topic_templates[key]:
                     return self.topic_templates[key][level]
         
-        return []
+        return ()
     
-    def _get_generic_templates(self, level: str) -> List[str]:
+    def _get_generic_templates(self, level: str) -> Tuple[str, ...]:
         """Get generic templates when no specific templates are found"""
-        generic_templates = {
-            "beginner": [
-                "What is {concept}?",
-                "How do you use {concept}?",
-                "What is the purpose of {concept}?",
-                "Which of the following describes {concept}?",
-                "When would you use {concept}?"
-            ],
-            "intermediate": [
-                "How does {concept} work?",
-                "What are the benefits of {concept}?",
-                "How would you implement {concept}?",
-                "What is the difference between {concept} and {alternative}?",
-                "What are the best practices for {concept}?"
-            ],
-            "advanced": [
-                "How would you optimize {concept}?",
-                "What are the advanced features of {concept}?",
-                "Design a solution using {concept}.",
-                "What are the trade-offs of using {concept}?",
-                "How does {concept} compare to alternatives?"
-            ]
-        }
-        
-        return generic_templates.get(level, generic_templates["beginner"])
+        return _GENERIC_TEMPLATES.get(level, _GENERIC_TEMPLATES["beginner"])
     
-    def _generate_single_question(self, request: QuestionRequest, templates: List[str], index: int) -> GeneratedQuestion:
-        """Generate a single question"""
-        # Select a random template
-        template = random.choice(templates)
-        
+    def _generate_single_question(self, request: QuestionRequest, topic_upper: str, topic_lower: str, template: str,
+                                  correct_text: str, reason: str, explanation_builder, option_order: Tuple[Tuple[int, ...], str],
+                                  question_id: str, index: int) -> GeneratedQuestion:
+        """Generate a single question from its pre-drawn template, correct text and explanation parts"""
         # Fill template with appropriate concepts
-        question_text = self._fill_template(template, request.topic, request.level, request.keywords)
+        question_text = self._fill_template(template, topic_upper, request.keywords)
         
-        # Generate options
-        options = self._generate_options(request.topic, request.level)
-        
-        # Select correct answer
-        correct_option = random.choice(list(options.keys()))
+        # Generate options; the correct answer is wherever the correct text landed
+        options, correct_option = self._generate_options(topic_upper, topic_lower, request.level, correct_text, option_order)
         
         # Generate explanation
-        explanation = self._generate_explanation(correct_option, options[correct_option], request.topic)
+        explanation = explanation_builder(correct_option, reason)
         
         # Determine core type
         core_type = request.core_type or self._determine_core_type(request.level, index)
         
         return GeneratedQuestion(
-            id=f"AI_GEN_{self.question_id_counter + index}",
+            id=question_id,
             core_type=core_type,
             level=request.level,
             topic=request.topic,
@@ -272,153 +459,76 @@ class TemplateQuestionGenerator:
             explanation=explanation
         )
     
-    def _fill_template(self, template: str, topic: str, level: str, keywords: Optional[List[str]]) -> str:
+    def _fill_template(self, template: str, topic_upper: str, keywords: Optional[List[str]]) -> str:
         """Fill template with appropriate concepts"""
-        topic_upper = topic.upper()
-        
         # Get concepts for the topic
-        concepts = self.technical_concepts.get(topic_upper, {})
-        
-        # Replace placeholders
-        if "{service}" in template and "services" in concepts:
-            template = template.replace("{service}", random.choice(concepts["services"]))
+        concepts = self._concepts_by_topic_upper.get(topic_upper, {})
         
-        if "{concept}" in template and "concepts" in concepts:
-            template = template.replace("{concept}", random.choice(concepts["concepts"]))
+        # Replace every known placeholder in one pass; unfillable ones are kept as written
+        def replace(match):
+            replacement = self._pick(match.group(1), concepts, keywords)
+            return match.group(0) if replacement is None else replacement
         
-        if "{scenario}" in template and "scenarios" in concepts:
-            template = template.replace("{scenario}", random.choice(concepts["scenarios"]))
-        
-        # Generic replacements
-        if "{function}" in template:
-            template = template.replace("{function}", f"the {random.choice(['appropriate', 'correct', 'suitable'])} function")
-        
-        if "{pattern}" in template:
-            template = template.replace("{pattern}", f"{random.choice(['design', 'implementation', 'coding'])} pattern")
-        
-        if "{feature}" in template:
-            template = template.replace("{feature}", f"the {random.choice(['main', 'key', 'primary'])} feature")
-        
-        # Use keywords if provided
-        if keywords:
-            for keyword in keywords:
-                if "{keyword}" in template:
-                    template = template.replace("{keyword}", keyword)
-        
-        return template
+        return _PLACEHOLDER_RE.sub(replace, template)
     
-    def _generate_options(self, topic: str, level: str) -> Dict[str, str]:
-        """Generate multiple choice options"""
-        options = {}
-        
-        # Generate one correct option
-        correct_text = self._generate_correct_option(topic, level)
-        
+    def _pick(self, placeholder: str, concepts: Dict[str, List[str]], keywords: Optional[List[str]]) -> Optional[str]:
+        """Pick the replacement for a single placeholder"""
+        return self._placeholder_pickers[placeholder](concepts, keywords)
+    
+    def _generate_options(self, topic_upper: str, topic_lower: str, level: str, correct_text: str,
+                          option_order: Tuple[Tuple[int, ...], str]) -> Tuple[Dict[str, str], str]:
+        """Generate multiple choice options around the correct text, with the correct letter"""
         # Generate incorrect options
-        incorrect_texts = self._generate_incorrect_options(topic, level, correct_text)
-        
-        # Combine and shuffle
-        all_options = [correct_text] + incorrect_texts
-        random.shuffle(all_options)
+        incorrect_texts = self._generate_incorrect_options(topic_upper, topic_lower, level, correct_text)
         
-        # Assign to letters A, B, C, D
-        for i, option_text in enumerate(all_options[:4]):
-            options[chr(65 + i)] = option_text  # A, B, C, D
-        
-        return options
+        # Assign the texts to letters A, B, C, D in the pre-drawn order
+        texts = (correct_text, incorrect_texts[0], incorrect_texts[1], incorrect_texts[2])
+        perm, correct_letter = option_order
+        options = {letter: texts[index] for letter, index in zip(_LETTERS, perm)}
+        return options, correct_letter
     
-    def _generate_correct_option(self, topic: str, level: str) -> str:
-        """Generate a correct option"""
-        topic_upper = topic.upper()
-        concepts = self.technical_concepts.get(topic_upper, {})
-        
-        if topic_upper == "AWS":
-            return random.choice([
-                "Provides scalable virtual servers in the cloud",
-                "Offers object storage with high durability",
-                "Enables serverless computing without provisioning servers",
-                "Manages relational databases with automated backups"
-            ])
-        elif topic_upper == "PYTHON":
-            return random.choice([
-                "A built-in function that performs the specified operation",
-                "A data structure that stores multiple values in an ordered sequence",
-                "A keyword that defines a reusable block of code",
-                "A method that processes each item in an iterable"
-            ])
-        elif topic_upper == "DOCKER":
-            return random.choice([
-                "A lightweight, standalone executable package that includes everything needed to run the application",
-                "A text file that contains instructions for building a Docker image",
-                "A storage mechanism that persists data generated by Docker containers",
-                "A virtual network that allows containers to communicate with each other"
-            ])
-        else:
-            return f"The correct approach for {topic.lower()} at {level} level"
+    def _sample_correct_options(self, topic_upper: str, topic_lower: str, level: str, k: int) -> List[str]:
+        """Draw k correct options in one call"""
+        pool = self._correct_pools.get(topic_upper)
+        if pool:
+            return random.choices(pool, k=k)
+        return [f"The correct approach for {topic_lower} at {level} level"] * k
     
-    def _generate_incorrect_options(self, topic: str, level: str, correct_text: str) -> List[str]:
+    def _generate_incorrect_options(self, topic_upper: str, topic_lower: str, level: str, correct_text: str) -> List[str]:
         """Generate incorrect but plausible options"""
         incorrect_options = []
         
-        topic_upper = topic.upper()
+        incorrect_pool = self._incorrect_pools.get(topic_upper, self._default_incorrect_pool)
+        weighted = self._incorrect_weights.get(topic_upper) if level == "advanced" else None
         
-        if topic_upper == "AWS":
-            incorrect_pool = [
-                "Manages user authentication and authorization",
-                "Provides content delivery network services",
-                "Monitors application performance and logs",
-                "Automates resource deployment and management"
-            ]
-        elif topic_upper == "PYTHON":
-            incorrect_pool = [
-                "Compiles Python code to machine language",
-                "Manages memory allocation and garbage collection",
-                "Provides syntax highlighting and code completion",
-                "Handles network communication between services"
-            ]
-        elif topic_upper == "DOCKER":
-            incorrect_pool = [
-                "Replaces virtual machines completely",
-                "Eliminates the need for operating systems",
-                "Provides automatic code compilation",
-                "Manages database transactions and queries"
-            ]
+        if weighted is not None and len(incorrect_pool) > 3 and correct_text not in incorrect_pool:
+            # Advanced quizzes draw three distinct distractors, favouring the harder ones
+            weights, w_max = weighted
+            while len(incorrect_options) < 3:
+                option = _weighted_pick(incorrect_pool, weights, w_max)
+                if option not in incorrect_options:
+                    incorrect_options.append(option)
         else:
-            incorrect_pool = [
-                "An outdated approach that is no longer recommended",
-                "A complex solution that requires extensive configuration",
-                "A temporary workaround with limited functionality",
-                "An experimental feature with no production support"
-            ]
-        
-        # Select options that are different from the correct one
-        for option in incorrect_pool:
-            if option != correct_text and len(incorrect_options) < 3:
-                incorrect_options.append(option)
+            # Select options that are different from the correct one
+            for option in incorrect_pool:
+                if option != correct_text and len(incorrect_options) < 3:
+                    incorrect_options.append(option)
         
         # Ensure we have 3 incorrect options
         while len(incorrect_options) < 3:
-            incorrect_options.append(f"An incorrect option about {topic.lower()}")
+            incorrect_options.append(f"An incorrect option about {topic_lower}")
         
         return incorrect_options[:3]
     
-    def _generate_explanation(self, correct_option: str, correct_text: str, topic: str) -> str:
-        """Generate an explanation for the correct answer"""
-        reasons = [
-            f"it accurately describes the primary function of {topic.lower()}",
-            f"it represents the correct way to implement {topic.lower()}",
-            f"it provides the most accurate definition for {topic.lower()}",
-            f"it correctly identifies the key characteristic of {topic.lower()}",
-            f"it aligns with best practices for {topic.lower()}"
+    def _explanation_reasons(self, topic_lower: str) -> List[str]:
+        """Reasons an explanation can give for the correct answer"""
+        return [
+            f"it accurately describes the primary function of {topic_lower}",
+            f"it represents the correct way to implement {topic_lower}",
+            f"it provides the most accurate definition for {topic_lower}",
+            f"it correctly identifies the key characteristic of {topic_lower}",
+            f"it aligns with best practices for {topic_lower}"
         ]
-        
-        reason = random.choice(reasons)
-        template = random.choice(self.explanation_templates)
-        
-        return template.format(
-            option=correct_option,
-            reason=reason
-        )
     
     def _determine_core_type(self, level: str, index: int) -> str:
         """Determine core type based on level and position"""
@@ -430,8 +540,9 @@ class TemplateQuestionGenerator:
         else:  # advanced
             return "baseline" if index < 3 else "variable"
     
-    def generate_quiz(self, topic: str, level: str, num_questions: int, keywords: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Generate a complete quiz"""
+    def _generate_quiz_parts(self, topic: str, level: str, num_questions: int, keywords: Optional[List[str]],
+                             generated_at: Optional[str]) -> Tuple[Dict[str, Any], List[GeneratedQuestion]]:
+        """Generate a quiz's questions along with its header fields, stamped with generated_at when given"""
         request = QuestionRequest(
             topic=topic,
             level=level,
@@ -439,15 +550,30 @@ class TemplateQuestionGenerator:
             keywords=keywords
         )
         
-        questions = self.generate_questions(request)
-        
-        return {
+        questions = list(self.generate_questions(request))
+        quiz = {
             "topic": topic,
             "level": level,
             "total_questions": len(questions),
-            "generated_at": datetime.now().isoformat(),
-            "questions": [self._question_to_dict(q) for q in questions]
+            "generated_at": generated_at or datetime.now().isoformat()
         }
+        return quiz, questions
+    
+    def generate_quiz(self, topic: str, level: str, num_questions: int, keywords: Optional[List[str]] = None,
+                      generated_at: Optional[str] = None) -> Dict[str, Any]:
+        """Generate a complete quiz, stamped with generated_at when given"""
+        quiz, questions = self._generate_quiz_parts(topic, level, num_questions, keywords, generated_at)
+        return {**quiz, "questions": [self._question_to_dict(q) for q in questions]}
+    
+    def generate_quiz_bytes(self, topic: str, level: str, num_questions: int, keywords: Optional[List[str]] = None,
+                            generated_at: Optional[str] = None) -> bytes:
+        """Generate a complete quiz serialized to JSON bytes, stamped with generated_at when given"""
+        quiz, questions = self._generate_quiz_parts(topic, level, num_questions, keywords, generated_at)
+        
+        # orjson serializes the dataclasses natively, without building a dict per question
+        if orjson is not None:
+            return orjson.dumps({**quiz, "questions": questions})
+        return json.dumps({**quiz, "questions": [self._question_to_dict(q) for q in questions]}).encode("utf-8")
     
     def _question_to_dict(self, question: GeneratedQuestion) -> Dict[str, Any]:
         """Convert GeneratedQuestion to dictionary"""
@@ -21,8 +21,8 @@ def print_banner():
 def check_python_version():
     """Check Python version"""
     print("🔍 Checking Python version...")
-    if sys.version_info < (3, 8):
-        print("❌ Python 3.8+ is required")
+    if sys.version_info < (3, 10):
+        print("❌ Python 3.10+ is required")
         print(f"   Current version: {sys.version}")
         return False
     else:
@@ -42,19 +42,23 @@ def install_dependencies():
             "pydantic>=2.4.0",
             "python-multipart>=0.0.6",
             "requests>=2.31.0",
-            "pandas>=2.0.0"
+            "httpx>=0.25.0",
+            "cachetools>=5.3.0",
+            "orjson>=3.9.0"
         ]
         
-        for package in essential_packages:
-            print(f"   Installing {package}...")
-            result = subprocess.run([
-                sys.executable, "-m", "pip", "install", package
-            ], capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                print(f"❌ Failed to install {package}")
-                print(f"   Error: {result.stderr}")
-                return False
+        # One pip invocation resolves every package together instead of restarting pip per package
+        print(f"   Installing {', '.join(essential_packages)}...")
+        result = subprocess.run([
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input", "--prefer-binary",
+            *essential_packages
+        ], capture_output=True, text=True)
+        
+        if result.returncode != 0:
+            print("❌ Failed to install dependencies")
+            print(f"   Error: {result.stderr}")
+            return False
         
         print("✅ Dependencies installed successfully")
         return True
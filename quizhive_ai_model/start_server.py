@@ -2,6 +2,7 @@
 Startup script for the AI Question Generator Server
 """
 
+import argparse
 import subprocess
 import sys
 import os
@@ -12,7 +13,8 @@ def check_dependencies():
     required_packages = [
         "fastapi",
         "uvicorn",
-        "pydantic"
+        "pydantic",
+        "cachetools"
     ]
     
     missing_packages = []
@@ -24,12 +26,12 @@ def check_dependencies():
     
     if missing_packages:
         print(f"Missing required packages: {missing_packages}")
-        print("Please install dependencies using: pip install fastapi uvicorn pydantic python-multipart")
+        print("Please install dependencies using: pip install fastapi uvicorn pydantic python-multipart cachetools")
         return False
     
     return True
 
-def start_server():
+def start_server(workers: int):
     """Start the AI Question Generator server"""
     if not check_dependencies():
         sys.exit(1)
@@ -43,6 +45,9 @@ def start_server():
     print("API Documentation: http://localhost:8001/docs")
     print("\nPress Ctrl+C to stop the server")
     
+    # Exported so each worker sizes its threads for the count actually started
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    
     # Start the server
     try:
         subprocess.run([
@@ -50,7 +55,8 @@ def start_server():
             "app:app",
             "--host", "0.0.0.0",
             "--port", "8001",
-            "--reload",
+            "--workers", str(workers),
+            "--no-access-log",
             "--log-level", "info"
         ], check=True)
     except KeyboardInterrupt:
@@ -60,4 +66,8 @@ def start_server():
         sys.exit(1)
 
 if __name__ == "__main__":
-    start_server()
+    parser = argparse.ArgumentParser(description="Start the AI Question Generator server")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)),
+                        help="Worker processes (default: WEB_CONCURRENCY, or one per core)")
+    args = parser.parse_args()
+    start_server(args.workers)
@@ -8,8 +8,14 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from model_server.ai_question_generator import AIQuestionGenerator
+from concurrent.futures import ThreadPoolExecutor
 import json
 
+QUESTION_COUNTS = [5, 10, 15]
+LEVELS = ['beginner', 'intermediate', 'advanced']
+REQUIRED_FIELDS = ['id', 'core_type', 'level', 'topic', 'question', 'options', 'correct', 'explanation']
+REQUIRED_SET = frozenset(REQUIRED_FIELDS)
+
 def test_generator():
     """Test the AI question generator"""
     print("=== TESTING AI QUESTION GENERATOR ===")
@@ -17,9 +23,18 @@ def test_generator():
     # Initialize generator
     generator = AIQuestionGenerator()
     
+    # Every quiz in the test matrix is independent; generate them concurrently on the one generator
+    cases = ([('Python', 'beginner', 8)]
+             + [('Python', 'beginner', num) for num in QUESTION_COUNTS]
+             + [('Python', level, 10) for level in LEVELS])
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        quizzes = list(executor.map(lambda case: generator.generate_quiz(*case), cases))
+    quiz = quizzes[0]
+    count_quizzes = quizzes[1:1 + len(QUESTION_COUNTS)]
+    level_quizzes = quizzes[1 + len(QUESTION_COUNTS):]
+    
     # Test 1: Generate 8 questions for Python beginner
     print("\n1. Testing 8 Python beginner questions (should be 5 baseline, 3 variable):")
-    quiz = generator.generate_quiz('Python', 'beginner', 8)
     
     # Check distribution
     baseline_count = sum(1 for q in quiz['questions'] if q['core_type'] == 'baseline')
@@ -37,12 +52,11 @@ def test_generator():
     
     # Test 2: Verify format matches expected structure
     print("\n2. Checking output format:")
-    required_fields = ['id', 'core_type', 'level', 'topic', 'question', 'options', 'correct', 'explanation']
-    
     for i, q in enumerate(quiz['questions']):
-        missing_fields = [field for field in required_fields if field not in q]
-        if missing_fields:
-            print(f"   Question {i+1} missing fields: {missing_fields}")
+        missing = REQUIRED_SET - q.keys()
+        if missing:
+            # Report in declaration order
+            print(f"   Question {i+1} missing fields: {[field for field in REQUIRED_FIELDS if field in missing]}")
         else:
             print(f"   Question {i+1}: ✓ All required fields present")
     
@@ -56,8 +70,7 @@ def test_generator():
     
     # Test 4: Test different numbers
     print("\n4. Testing different question counts:")
-    for num in [5, 10, 15]:
-        test_quiz = generator.generate_quiz('Python', 'beginner', num)
+    for num, test_quiz in zip(QUESTION_COUNTS, count_quizzes):
         baseline = sum(1 for q in test_quiz['questions'] if q['core_type'] == 'baseline')
         variable = sum(1 for q in test_quiz['questions'] if q['core_type'] == 'variable')
         expected_baseline = int(num * 0.6)
@@ -66,8 +79,7 @@ def test_generator():
     
     # Test 5: Test different levels
     print("\n5. Testing different levels:")
-    for level in ['beginner', 'intermediate', 'advanced']:
-        test_quiz = generator.generate_quiz('Python', level, 10)
+    for level, test_quiz in zip(LEVELS, level_quizzes):
         baseline = sum(1 for q in test_quiz['questions'] if q['core_type'] == 'baseline')
         variable = sum(1 for q in test_quiz['questions'] if q['core_type'] == 'variable')
         print(f"   {level}: {baseline}:{variable}")
@@ -3,13 +3,94 @@ Question Bank Pattern Extractor
 Analyzes existing questions to extract templates and patterns for generation
 """
 
+import csv
 import json
 import os
 import re
 from collections import defaultdict, Counter
-from typing import Dict, List, Any, Tuple
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+# Threads used to read question bank files
+LOAD_WORKERS = 8
+# Bank files above this size are streamed with ijson instead of parsed whole
+STREAM_THRESHOLD_BYTES = 64 * 1024 * 1024
+# Output file buffer, so the CSV rows reach the OS in a few large writes
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Common technical terms replaced by _create_question_pattern
+TECH_TERMS = (
+    'AWS', 'EC2', 'S3', 'Lambda', 'RDS', 'VPC', 'IAM', 'CloudFormation',
+    'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Node.js',
+    'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL',
+    'Docker', 'Kubernetes', 'Jenkins', 'Git', 'Linux'
+)
+# All terms in one alternation, so each question is scanned once instead of once per term
+_TECH_TERM_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, TECH_TERMS)) + r')\b', re.IGNORECASE)
+_NUMBER_RE = re.compile(r'\b\d+\b')
+_VALUE_RE = re.compile(r'["\'][^"\']+["\']')
+
+# Question type by its leading wh-word, keyed by exact prefix so "What's" still counts as 'what'
+_STARTER_MAP = {'How': 'how', 'Why': 'why', 'What': 'what', 'When': 'when', 'Which': 'which', 'Where': 'where'}
+# First letters of the starters; anything else is 'other' without a prefix lookup
+_STARTER_INITIALS = frozenset(starter[0] for starter in _STARTER_MAP)
+
+
+def _compile_tech_term_db():
+    """Compile every tech term into one Hyperscan database, or None when hyperscan is not installed"""
+    if hyperscan is None:
+        return None
+    # Hyperscan has no Unicode \b, so the database is ASCII-only and only scans ASCII questions
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[rb'\b' + re.escape(term).encode('ascii') + rb'\b' for term in TECH_TERMS],
+        ids=list(range(len(TECH_TERMS))),
+        flags=[flags] * len(TECH_TERMS)
+    )
+    return db
+
+
+_TECH_TERM_DB = _compile_tech_term_db()
+
+
+def _replace_tech_terms(question: str) -> str:
+    """Replace every tech term with {TECH_TERM}, scanning with Hyperscan's DFA when it is available"""
+    # Word boundaries and case folding only agree with re for ASCII text
+    if _TECH_TERM_DB is None or not question.isascii():
+        return _TECH_TERM_RE.sub('{TECH_TERM}', question)
+    
+    data = question.encode('ascii')
+    spans = []
+    _TECH_TERM_DB.scan(data, match_event_handler=lambda term_id, start, end, flags, context: spans.append((start, end)))
+    if not spans:
+        return question
+    
+    # Keep the leftmost non-overlapping matches, as re.sub does
+    parts = []
+    position = 0
+    for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if start < position:
+            continue
+        parts.append(data[position:start])
+        parts.append(b'{TECH_TERM}')
+        position = end
+    parts.append(data[position:])
+    return b''.join(parts).decode('ascii')
 
 
 class QuestionPatternExtractor:
@@ -18,36 +99,62 @@ class QuestionPatternExtractor:
         self.questions = []
         self.patterns = {}
         self.templates = {}
+        # Groupings by topic, level and core type, shared by analysis and template extraction
+        self._grouped = None
+        self._grouped_key = None
         
     def load_questions(self) -> List[Dict]:
         """Load questions from JSON files"""
         questions = []
         
-        # Load from sample.json first
+        # Bank files are read on a small thread pool; results are merged in a fixed order (sample.json first)
         sample_file = os.path.join(self.question_bank_path, "sample.json")
-        if os.path.exists(sample_file):
-            with open(sample_file, 'r', encoding='utf-8') as f:
-                sample_questions = json.load(f)
-                questions.extend(sample_questions)
-                print(f"Loaded {len(sample_questions)} questions from sample.json")
-        
-        # Look for other JSON files in the directory
-        for file in os.listdir(self.question_bank_path):
-            if file.endswith('.json') and file != 'sample.json':
-                file_path = os.path.join(self.question_bank_path, file)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        file_questions = json.load(f)
-                        if isinstance(file_questions, list):
-                            questions.extend(file_questions)
-                            print(f"Loaded {len(file_questions)} questions from {file}")
-                except Exception as e:
-                    print(f"Error loading {file}: {e}")
+        files = sorted(file for file in os.listdir(self.question_bank_path) if file.endswith('.json') and file != 'sample.json')
+        
+        with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+            sample_future = executor.submit(self._read_question_list, sample_file) if os.path.exists(sample_file) else None
+            loaded = list(executor.map(self._load_one, files))
+            sample_questions = sample_future.result() if sample_future is not None else None
+        
+        if sample_questions is not None:
+            questions.extend(sample_questions)
+            print(f"Loaded {len(sample_questions)} questions from sample.json")
+        
+        for file, (file_questions, error) in zip(files, loaded):
+            if error is not None:
+                print(f"Error loading {file}: {error}")
+            elif file_questions is not None:
+                questions.extend(file_questions)
+                print(f"Loaded {len(file_questions)} questions from {file}")
         
         self.questions = questions
         print(f"Total questions loaded: {len(self.questions)}")
         return questions
     
+    def _load_one(self, file: str) -> Tuple[Optional[List[Dict]], Optional[Exception]]:
+        """Read one bank file, returning its questions or the error instead of raising"""
+        try:
+            return self._read_question_list(os.path.join(self.question_bank_path, file)), None
+        except Exception as e:
+            return None, e
+    
+    def _read_question_list(self, file_path: str) -> Optional[List[Dict]]:
+        """Read the question list in a JSON file, or None if the file does not hold a list"""
+        with open(file_path, 'rb') as f:
+            # Large banks are streamed record by record when ijson is installed; the rest parse in one C call
+            if ijson is not None and os.fstat(f.fileno()).st_size > STREAM_THRESHOLD_BYTES:
+                # Only a top-level array holds questions; peek at its first byte before streaming
+                first = f.read(1)
+                while first.isspace():
+                    first = f.read(1)
+                if first != b'[':
+                    return None
+                f.seek(0)
+                return list(ijson.items(f, 'item', use_float=True))
+            
+            data = orjson.loads(f.read()) if orjson is not None else json.load(f)
+            return data if isinstance(data, list) else None
+    
     def analyze_question_structure(self) -> Dict:
         """Analyze the structure of questions"""
         if not self.questions:
@@ -63,56 +170,49 @@ class QuestionPatternExtractor:
             'explanation_patterns': {}
         }
         
-        # Analyze topics
-        topics = [q.get('topic', 'unknown') for q in self.questions]
-        analysis['topics'] = dict(Counter(topics))
+        # Topic, level and core type counts come from the shared groupings
+        by_topic, by_level, by_core_type = self._group()
         
-        # Analyze levels
-        levels = [q.get('level', 'unknown') for q in self.questions]
-        analysis['levels'] = dict(Counter(levels))
-        
-        # Analyze core types
-        core_types = [q.get('core_type', 'unknown') for q in self.questions]
-        analysis['core_types'] = dict(Counter(core_types))
-        
-        # Analyze question patterns
-        question_starters = []
-        question_lengths = []
+        # One pass over the bank feeds the remaining counters and length accumulators
+        total = len(self.questions)
+        question_starters = Counter()
+        # Lengths only feed averages and small-integer histograms, so keep running totals instead of lists
+        length_distribution = Counter()
+        option_counts = Counter()
+        question_length_total = 0
+        option_count_total = 0
+        explanation_length_total = 0
         
         for q in self.questions:
-            question_text = q.get('question', '')
-            question_lengths.append(len(question_text.split()))
-            
+            words = q.get('question', '').split()
+            question_length_total += len(words)
+            length_distribution[min(len(words), 20)] += 1
             # Extract question starters (first few words)
-            words = question_text.split()[:3]
             if words:
-                question_starters.append(' '.join(words))
+                question_starters[' '.join(words[:3])] += 1
+            
+            option_count = len(q.get('options', {}))
+            option_counts[option_count] += 1
+            option_count_total += option_count
+            explanation_length_total += len(q.get('explanation', '').split())
+        
+        analysis['topics'] = {topic: len(group) for topic, group in by_topic.items()}
+        analysis['levels'] = {level: len(group) for level, group in by_level.items()}
+        analysis['core_types'] = {core_type: len(group) for core_type, group in by_core_type.items()}
         
         analysis['question_patterns'] = {
-            'starters': dict(Counter(question_starters).most_common(20)),
-            'avg_length': sum(question_lengths) / len(question_lengths) if question_lengths else 0,
-            'length_distribution': dict(Counter([min(l, 20) for l in question_lengths]))
+            'starters': dict(question_starters.most_common(20)),
+            'avg_length': question_length_total / total,
+            'length_distribution': dict(length_distribution)
         }
         
-        # Analyze options
-        option_counts = []
-        for q in self.questions:
-            options = q.get('options', {})
-            option_counts.append(len(options))
-        
         analysis['option_patterns'] = {
-            'counts': dict(Counter(option_counts)),
-            'avg_count': sum(option_counts) / len(option_counts) if option_counts else 0
+            'counts': dict(option_counts),
+            'avg_count': option_count_total / total
         }
         
-        # Analyze explanations
-        explanation_lengths = []
-        for q in self.questions:
-            explanation = q.get('explanation', '')
-            explanation_lengths.append(len(explanation.split()))
-        
         analysis['explanation_patterns'] = {
-            'avg_length': sum(explanation_lengths) / len(explanation_lengths) if explanation_lengths else 0
+            'avg_length': explanation_length_total / total
         }
         
         return analysis
@@ -127,18 +227,7 @@ class QuestionPatternExtractor:
         }
         
         # Group questions by different criteria
-        by_topic = defaultdict(list)
-        by_level = defaultdict(list)
-        by_core_type = defaultdict(list)
-        
-        for q in self.questions:
-            topic = q.get('topic', 'unknown')
-            level = q.get('level', 'unknown')
-            core_type = q.get('core_type', 'unknown')
-            
-            by_topic[topic].append(q)
-            by_level[level].append(q)
-            by_core_type[core_type].append(q)
+        by_topic, by_level, by_core_type = self._group()
         
         # Extract templates for each group
         templates['by_topic'] = self._create_group_templates(by_topic)
@@ -150,6 +239,25 @@ class QuestionPatternExtractor:
         
         return templates
     
+    def _group(self) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+        """Group questions by topic, level and core type, reusing the grouping until the bank changes"""
+        # Keyed on the list object itself (not its id, which a replacement list could reuse) plus its length
+        if self._grouped is not None and self._grouped_key[0] is self.questions and self._grouped_key[1] == len(self.questions):
+            return self._grouped
+        
+        by_topic = defaultdict(list)
+        by_level = defaultdict(list)
+        by_core_type = defaultdict(list)
+        
+        for q in self.questions:
+            by_topic[q.get('topic', 'unknown')].append(q)
+            by_level[q.get('level', 'unknown')].append(q)
+            by_core_type[q.get('core_type', 'unknown')].append(q)
+        
+        self._grouped = (by_topic, by_level, by_core_type)
+        self._grouped_key = (self.questions, len(self.questions))
+        return self._grouped
+    
     def _create_group_templates(self, group_dict: Dict) -> Dict:
         """Create templates for a grouped set of questions"""
         templates = {}
@@ -158,31 +266,23 @@ class QuestionPatternExtractor:
             if len(questions) < 2:  # Need at least 2 questions to create a template
                 continue
             
-            # Extract common patterns
-            question_patterns = []
-            option_patterns = []
-            
-            for q in questions:
-                question_text = q.get('question', '')
-                
-                # Create a pattern by replacing specific terms with placeholders
-                pattern = self._create_question_pattern(question_text)
-                question_patterns.append(pattern)
-                
-                # Analyze options
-                options = q.get('options', {})
-                if options:
-                    option_patterns.append(list(options.keys()))
+            # Count patterns straight from generators; no per-group pattern lists are built.
+            # Each question pattern replaces specific terms with placeholders
+            question_patterns = Counter(self._create_question_pattern(q.get('question', '')) for q in questions)
+            option_patterns = Counter(
+                tuple(options.keys()) for options in (q.get('options', {}) for q in questions) if options
+            )
             
             # Find most common patterns
-            common_question_patterns = Counter(question_patterns).most_common(5)
-            common_option_patterns = Counter([tuple(p) for p in option_patterns]).most_common(3)
+            common_question_patterns = question_patterns.most_common(5)
+            common_option_patterns = option_patterns.most_common(3)
             
             templates[group_name] = {
                 'question_count': len(questions),
                 'question_patterns': [pattern for pattern, count in common_question_patterns],
                 'option_patterns': [list(pattern) for pattern, count in common_option_patterns],
-                'sample_questions': questions[:3]  # Keep sample questions
+                # Reference samples by ID instead of copying whole questions into the templates
+                'sample_question_ids': [q.get('id') for q in questions[:3]]
             }
         
         return templates
@@ -190,24 +290,13 @@ class QuestionPatternExtractor:
     def _create_question_pattern(self, question: str) -> str:
         """Create a pattern from a question by replacing specific terms"""
         # Replace technical terms with placeholders
-        pattern = question
-        
-        # Common technical terms to replace
-        tech_terms = [
-            'AWS', 'EC2', 'S3', 'Lambda', 'RDS', 'VPC', 'IAM', 'CloudFormation',
-            'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Node.js',
-            'SQL', 'NoSQL', 'MongoDB', 'PostgreSQL', 'MySQL',
-            'Docker', 'Kubernetes', 'Jenkins', 'Git', 'Linux'
-        ]
-        
-        for term in tech_terms:
-            pattern = re.sub(rf'\b{term}\b', '{TECH_TERM}', pattern, flags=re.IGNORECASE)
+        pattern = _replace_tech_terms(question)
         
         # Replace numbers
-        pattern = re.sub(r'\b\d+\b', '{NUMBER}', pattern)
+        pattern = _NUMBER_RE.sub('{NUMBER}', pattern)
         
         # Replace specific values
-        pattern = re.sub(r'["\'][^"\']+["\']', '{VALUE}', pattern)
+        pattern = _VALUE_RE.sub('{VALUE}', pattern)
         
         return pattern
     
@@ -218,19 +307,10 @@ class QuestionPatternExtractor:
         for q in self.questions:
             question_text = q.get('question', '')
             
-            # Identify question type
-            if question_text.startswith('What'):
-                q_type = 'what'
-            elif question_text.startswith('How'):
-                q_type = 'how'
-            elif question_text.startswith('Why'):
-                q_type = 'why'
-            elif question_text.startswith('Which'):
-                q_type = 'which'
-            elif question_text.startswith('When'):
-                q_type = 'when'
-            elif question_text.startswith('Where'):
-                q_type = 'where'
+            # Identify question type with at most three prefix lookups, only for W/H stems
+            if question_text[:1] in _STARTER_INITIALS:
+                q_type = (_STARTER_MAP.get(question_text[:3]) or _STARTER_MAP.get(question_text[:4])
+                          or _STARTER_MAP.get(question_text[:5]) or 'other')
             else:
                 q_type = 'other'
             
@@ -267,21 +347,35 @@ class QuestionPatternExtractor:
         
         # Save basic analysis
         analysis = self.analyze_question_structure()
-        with open(os.path.join(output_dir, 'question_analysis.json'), 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, indent=2, ensure_ascii=False)
+        self._write_json(os.path.join(output_dir, 'question_analysis.json'), analysis)
         
         # Save templates
         templates = self.extract_templates()
-        with open(os.path.join(output_dir, 'question_templates.json'), 'w', encoding='utf-8') as f:
-            json.dump(templates, f, indent=2, ensure_ascii=False)
+        self._write_json(os.path.join(output_dir, 'question_templates.json'), templates)
         
         # Save questions as CSV for easy analysis
         if self.questions:
-            df = pd.DataFrame(self.questions)
-            df.to_csv(os.path.join(output_dir, 'questions.csv'), index=False)
+            # Stream rows straight to disk; columns are the union of keys in first-seen order
+            fields = list(dict.fromkeys(key for q in self.questions for key in q))
+            with open(os.path.join(output_dir, 'questions.csv'), 'w', encoding='utf-8', newline='',
+                      buffering=WRITE_BUFFER_BYTES) as f:
+                writer = csv.DictWriter(f, fieldnames=fields, lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(self.questions)
         
         print(f"Analysis saved to {output_dir}/")
         return analysis, templates
+    
+    def _write_json(self, path: str, data: Any):
+        """Write indented UTF-8 JSON with a single write() call"""
+        if orjson is not None:
+            # Length histograms have int keys, which json.dump writes as strings
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            # json.dump would issue one small write per token; encode the whole document first
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(path, 'wb', buffering=WRITE_BUFFER_BYTES) as f:
+            f.write(payload)
 
 
 def main():